@@ -0,0 +1,245 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from tkinter import Misc, TclError, Tk
+from weakref import WeakKeyDictionary
+
+# Frames are run on multiples of this interval
+FRAME_INTERVAL = 1 / 60  # Seconds
+
+# Longest time step passed to the callbacks, so that animations don't jump
+# after the event loop was blocked for a while
+MAX_STEP = 0.1  # Seconds
+
+# Called every frame with the time since the previous one in seconds, the
+# callback is removed once it returns False
+FrameCallback = Callable[[float], bool]
+
+
+@dataclass
+class FrameStats:
+    frames: int  # Frames run
+    dropped: int  # Frames skipped because the event loop was busy
+    mean_time: float  # Mean time spent running the callbacks per frame in seconds
+    max_time: float  # Longest time spent running the callbacks in one frame in seconds
+    active: int  # Callbacks currently running
+
+
+class FrameScheduler:
+    """
+    Runs the callbacks of all animations on the Tk event loop, in one batch
+    per frame. Frames are timed with the monotonic clock so that late timers
+    don't accumulate drift, and frames that were missed while the event loop
+    was busy are dropped instead of run late in a burst. The timer only runs
+    while there are callbacks.
+    """
+
+    schedulers: WeakKeyDictionary[Tk, "FrameScheduler"] = WeakKeyDictionary()
+
+    def __init__(self, root: Tk, interval: float = FRAME_INTERVAL) -> None:
+        self.root = root
+        self.interval = interval
+        self.callbacks: dict[int, FrameCallback] = {}
+        self.next_handle = 0
+        self.timer: str | None = None
+        self.deadline = 0.0  # Monotonic time of the next frame
+        self.last = 0.0  # Monotonic time of the previous frame
+
+        self.frames = 0
+        self.dropped = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @classmethod
+    def of(cls, widget: Misc) -> "FrameScheduler":
+        # Shared by all widgets of the same Tk instance
+        root = widget._root()
+        if root not in cls.schedulers:
+            cls.schedulers[root] = cls(root)
+        return cls.schedulers[root]
+
+    def add(self, callback: FrameCallback) -> int:
+        handle = self.next_handle
+        self.next_handle += 1
+        self.callbacks[handle] = callback
+
+        if self.timer is None:
+            self.last = self.deadline = time.monotonic()
+            self.schedule()
+
+        return handle
+
+    def remove(self, handle: int | None) -> None:
+        self.callbacks.pop(handle, None)
+
+    def schedule(self) -> None:
+        self.deadline += self.interval
+        now = time.monotonic()
+        if now > self.deadline:
+            missed = int((now - self.deadline) / self.interval) + 1
+            self.dropped += missed
+            self.deadline += missed * self.interval
+
+        self.timer = self.root.after(max(round((self.deadline - now) * 1000), 1), self.tick)
+
+    def tick(self) -> None:
+        start = time.monotonic()
+        step = min(start - self.last, MAX_STEP)
+        self.last = start
+
+        for handle, callback in list(self.callbacks.items()):
+            try:
+                running = callback(step)
+            except TclError:
+                running = False  # The animated widget was destroyed
+            except Exception as e:
+                logging.warning(f"Animation failed. Reason: {e}")
+                running = False
+            if not running:
+                self.callbacks.pop(handle, None)
+
+        elapsed = time.monotonic() - start
+        self.frames += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+        if self.callbacks:
+            self.schedule()
+        else:
+            self.timer = None
+
+    def stats(self) -> FrameStats:
+        return FrameStats(self.frames, self.dropped, self.total_time / self.frames if self.frames else 0.0, self.max_time, len(self.callbacks))
+
+
+# Maps the linear progress of a tween from 0 to 1 to the eased progress
+Easing = Callable[[float], float]
+
+
+def linear(t: float) -> float:
+    return t
+
+
+def ease_in(t: float) -> float:
+    return t * t
+
+
+def ease_out(t: float) -> float:
+    return 1 - (1 - t) * (1 - t)
+
+
+def ease_in_out(t: float) -> float:
+    return t * t * (3 - 2 * t)
+
+
+class Tween:
+    """Transition of a value, like an opacity or a volume, over a duration"""
+
+    def __init__(self, apply: Callable[[float], None], start: float, end: float, duration: float, easing: Easing, done: Callable[[], None] | None) -> None:
+        self.apply = apply
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.easing = easing
+        self.done = done
+        self.elapsed = 0.0
+        self.cancelled = False
+
+    def advance(self, step: float) -> bool:
+        # Returns False once finished
+        self.elapsed += step
+        t = min(self.elapsed / self.duration, 1.0) if self.duration > 0 else 1.0
+        self.apply(self.start + (self.end - self.start) * self.easing(t))
+        return t < 1.0
+
+    def cancel(self) -> None:
+        # The done callback isn't called for cancelled tweens
+        self.cancelled = True
+
+
+class TweenEngine:
+    """
+    Advances all tweens of a Tk instance from a single frame callback, which
+    is only scheduled while there are tweens running.
+    """
+
+    engines: WeakKeyDictionary[Tk, "TweenEngine"] = WeakKeyDictionary()
+
+    def __init__(self, scheduler: FrameScheduler) -> None:
+        self.scheduler = scheduler
+        self.tweens: list[Tween] = []
+        self.handle: int | None = None
+
+    @classmethod
+    def of(cls, widget: Misc) -> "TweenEngine":
+        root = widget._root()
+        if root not in cls.engines:
+            cls.engines[root] = cls(FrameScheduler.of(root))
+        return cls.engines[root]
+
+    def add(
+        self,
+        apply: Callable[[float], None],
+        start: float,
+        end: float,
+        duration: float,
+        easing: Easing = linear,
+        done: Callable[[], None] | None = None,
+    ) -> Tween:
+        tween = Tween(apply, start, end, duration, easing, done)
+        self.tweens.append(tween)
+        if self.handle is None:
+            self.handle = self.scheduler.add(self.advance)
+        return tween
+
+    def advance(self, step: float) -> bool:
+        count = len(self.tweens)
+        running = []
+        finished = []
+        for tween in self.tweens[:count]:
+            if tween.cancelled:
+                continue
+
+            try:
+                if tween.advance(step):
+                    running.append(tween)
+                else:
+                    finished.append(tween)
+            except TclError:
+                pass  # The widget of the tween was destroyed
+            except Exception as e:
+                logging.warning(f"Tween failed. Reason: {e}")
+
+        for tween in finished:
+            if tween.done and not tween.cancelled:
+                try:
+                    tween.done()
+                except TclError:
+                    pass
+                except Exception as e:
+                    logging.warning(f"Tween callback failed. Reason: {e}")
+
+        # Tweens added by the done callbacks are kept
+        self.tweens = running + self.tweens[count:]
+        if not self.tweens:
+            self.handle = None
+            return False
+        return True
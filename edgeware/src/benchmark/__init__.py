@@ -0,0 +1,64 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import platform
+import subprocess
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from paths import PATH
+
+
+def rate(function: Callable[[], object], duration: float = 1.0) -> float:
+    """Calls function repeatedly for about duration seconds, returns calls per second"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        function()
+        calls += 1
+
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return calls / elapsed
+
+
+def seconds(function: Callable[[], object], duration: float = 1.0) -> float:
+    """Like rate, but returns the average seconds per call"""
+    return 1 / rate(function, duration)
+
+
+def commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=PATH, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(path: Path, duration: float, results: dict[str, dict]) -> None:
+    """Writes the results as JSON along with what is needed to compare them between commits"""
+    report = {
+        "commit": commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "duration": duration,
+        "results": results,
+    }
+    path.write_text(json.dumps(report, indent=4))
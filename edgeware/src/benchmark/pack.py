@@ -0,0 +1,201 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import random
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from pack import Pack
+from paths import Data
+
+from benchmark import rate, seconds
+
+SIZES = [1_000, 10_000, 50_000]
+MOODS = 20
+CAPTIONS = 10  # Per mood
+
+# The smallest files that filetype (and Pillow for images) recognizes
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c4890000000d49444154789c6360606060000000050001a5f645400000000049454e44ae426082"
+)
+GIF = bytes.fromhex("474946383761010001008000000000000000002c000000000100010000080400010404003b")
+MP4 = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isommp42"
+MP3 = b"ID3\x03\x00\x00\x00\x00\x00\x00"
+
+
+@contextmanager
+def isolated_data() -> Iterator[Path]:
+    """Points the data directories to a temporary directory, so that benchmarks leave no caches behind"""
+    original = {key: value for key, value in vars(Data).items() if isinstance(value, Path)}
+
+    with tempfile.TemporaryDirectory(prefix="edgeware-benchmark-") as temp:
+        root = Path(temp)
+        for key, value in original.items():
+            setattr(Data, key, root / value.relative_to(original["ROOT"]))
+        try:
+            yield root
+        finally:
+            for key, value in original.items():
+                setattr(Data, key, value)
+
+
+def load_pack(root: Path) -> Pack:
+    pack = Pack(root)
+    # Scaled variants are written in the background, which has to be done
+    # before the temporary data directory is deleted
+    pack.scaled.close()
+    return pack
+
+
+def generate_pack(
+    root: Path,
+    images: int = 1000,
+    videos: int = 100,
+    audio: int = 100,
+    hypnos: int = 10,
+    moods: int = MOODS,
+    captions: int = CAPTIONS,
+    legacy: bool = False,
+    corruption_levels: int = 5,
+) -> Path:
+    """
+    Generates a pack with the given amounts of media and moods. Media is spread
+    evenly over the moods and the default mood. Legacy packs use the deprecated
+    captions, media, prompt and web files instead of index.json.
+    """
+
+    mood_names = [f"mood{n}" for n in range(moods)]
+
+    media_moods: dict[str, list[str]] = {name: [] for name in mood_names}
+    for dir, extension, header, count in [
+        ("img", "png", PNG, images),
+        ("vid", "mp4", MP4, videos),
+        ("aud", "mp3", MP3, audio),
+        ("subliminals", "gif", GIF, hypnos),
+    ]:
+        (root / dir).mkdir(parents=True, exist_ok=True)
+        for n in range(count):
+            name = f"{dir}{n}.{extension}"
+            (root / dir / name).write_bytes(header)
+            if dir != "subliminals" and n % (moods + 1) < moods:
+                media_moods[mood_names[n % (moods + 1)]].append(name)
+
+    def lines(kind: str, mood: str) -> list[str]:
+        return [f"{mood} {kind} {n}" for n in range(captions)]
+
+    def write(name: str, data: dict) -> None:
+        (root / name).write_text(json.dumps(data))
+
+    if legacy:
+        write("media.json", {mood: files for mood, files in media_moods.items() if files})
+        write(
+            "captions.json",
+            {
+                "prefix": mood_names,
+                "default": lines("caption", "default"),
+                "denial": lines("denial", "default"),
+                "subliminals": lines("subliminal", "default"),
+                "notifications": lines("notification", "default"),
+                **{mood: lines("caption", mood) for mood in mood_names},
+            },
+        )
+        write(
+            "prompt.json",
+            {
+                "moods": ["default", *mood_names],
+                "freqList": [1] * (moods + 1),
+                "minLen": 1,
+                "maxLen": 3,
+                "default": lines("prompt", "default"),
+                **{mood: lines("prompt", mood) for mood in mood_names},
+            },
+        )
+        write("web.json", {"urls": [f"https://example.com/{mood}" for mood in mood_names], "args": ["a,b"] * moods, "moods": mood_names})
+    else:
+
+        def base(mood: str) -> dict:
+            return {
+                "captions": lines("caption", mood),
+                "denial": lines("denial", mood),
+                "subliminals": lines("subliminal", mood),
+                "notifications": lines("notification", mood),
+                "prompts": lines("prompt", mood),
+                "web": [f"https://example.com/{mood}"],
+                "webArgs": [["a", "b"]],
+            }
+
+        write("index.json", {"default": base("default"), "moods": [{**base(mood), "mood": mood, "media": media_moods[mood]} for mood in mood_names]})
+
+    # Every level adds a few more moods
+    step = max(moods // max(corruption_levels, 1), 1)
+    levels = {str(n + 1): {"add": mood_names[n * step : (n + 1) * step], "remove": []} for n in range(corruption_levels)}
+    write("corruption.json", {"moods": levels, "wallpapers": {}, "config": {}})
+    write("info.json", {"name": "Benchmark", "id": "benchmark", "creator": "Benchmark", "version": "1.0", "description": "Generated pack"})
+
+    return root
+
+
+def run(duration: float) -> dict:
+    results = {}
+    with isolated_data() as data:
+        print(f"{'Media':>8} {'Pack':>8} {'Cold load':>10} {'Warm load':>10} {'Images/s':>10} {'Lists/s':>10} {'Switches/s':>11}")
+        for size in SIZES:
+            for legacy in [False, True]:
+                kind = "legacy" if legacy else "index"
+                root = generate_pack(data / f"pack-{kind}-{size}", images=size, videos=size // 10, audio=size // 10, legacy=legacy)
+
+                def cold_load() -> Pack:
+                    shutil.rmtree(Data.CACHE, ignore_errors=True)
+                    Data.MOOD_FINGERPRINTS.unlink(missing_ok=True)
+                    return load_pack(root)
+
+                cold = seconds(cold_load, duration)
+                warm = seconds(lambda: load_pack(root), duration)
+
+                pack = load_pack(root)
+                images = rate(pack.random_image, duration)
+                lists = rate(lambda: pack.find_list("captions"), duration)
+
+                # Corruption fades between two levels, so the active moods
+                # change between consecutive popups
+                levels = pack.corruption_levels
+
+                def switch() -> None:
+                    moods = random.choice(levels).moods
+                    pack.active_moods = lambda: moods
+                    pack.random_image()
+                    pack.random_caption()
+
+                switches = rate(switch, duration) if levels else 0.0
+
+                results[f"{kind}-{size}"] = {
+                    "media": size,
+                    "legacy": legacy,
+                    "cold_load_seconds": cold,
+                    "warm_load_seconds": warm,
+                    "random_image_per_second": images,
+                    "find_list_per_second": lists,
+                    "corruption_switch_per_second": switches,
+                }
+                print(f"{size:>8} {kind:>8} {cold:>9.3f}s {warm:>9.3f}s {images:>10.0f} {lists:>10.0f} {switches:>11.0f}")
+
+    return results
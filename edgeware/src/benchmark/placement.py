@@ -0,0 +1,100 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+
+from placement import CELL_SIDE, PopupGeometries, choose_cell
+from screeninfo import Monitor
+
+from benchmark import rate
+
+POPUPS = [10, 100, 1000]
+MONITORS = [Monitor(0, 0, 1920, 1080), Monitor(1920, 0, 2560, 1440)]
+POPUP_SIZE = (640, 480)
+
+
+def legacy_choose_cell(geometries: dict[int, tuple[int, int, int, int]], monitor: Monitor, width: int, height: int) -> tuple[int, int]:
+    """Popup.compute_geometry before the placement engine, kept for comparison"""
+
+    positions = []
+    weights = []
+
+    side = CELL_SIDE
+    area_width = monitor.width - width
+    area_height = monitor.height - height
+    for x_index in range(area_width // side):
+        for y_index in range(area_height // side):
+            sx = x_index * side + monitor.x
+            sy = y_index * side + monitor.y
+            sw = width
+            sh = height
+
+            values = geometries.copy().values()
+            weight = float("inf") if values else 1
+            for w, h, x, y in values:
+                intersection = max(0, min(sx + sw, x + w) - max(sx, x)) * max(0, min(sy + sh, y + h) - max(sy, y))
+                nonoverlap = 1 - intersection / (sw * sh)
+                distance_squared = (sx + sw / 2 - (x + w / 2)) ** 2 + (sy + sh / 2 - (y + h / 2)) ** 2
+                weight = min(2 ** (32 * nonoverlap) + distance_squared, weight)
+
+            positions.append((sx, sy))
+            weights.append(weight)
+
+    return random.choices(positions, weights)[0]
+
+
+def open_popups(count: int) -> tuple[dict[int, tuple[int, int, int, int]], PopupGeometries]:
+    legacy = {}
+    geometries = PopupGeometries()
+    for popup_id in range(count):
+        monitor = random.choices(MONITORS, [9, 1])[0]
+        width = random.randint(200, 800)
+        height = random.randint(200, min(800, monitor.height))
+        geometry = (width, height, random.randint(monitor.x, monitor.x + monitor.width - width), random.randint(monitor.y, monitor.y + monitor.height - height))
+        legacy[popup_id] = geometry
+        geometries.add(popup_id, geometry, monitor)
+    return legacy, geometries
+
+
+def run(duration: float) -> dict:
+    results = {}
+    monitor = MONITORS[0]
+
+    # Both consume the same random numbers, so the same seed gives the same cells
+    legacy, geometries = open_popups(50)
+    for seed in range(100):
+        random.seed(seed)
+        expected = legacy_choose_cell(legacy, monitor, *POPUP_SIZE)
+        random.seed(seed)
+        assert choose_cell(geometries, monitor, *POPUP_SIZE) == expected, f"Placement differs with seed {seed}"
+
+    print(f"Placements per second of a {POPUP_SIZE[0]}x{POPUP_SIZE[1]} popup on a {monitor.width}x{monitor.height} monitor")
+    print(f"{'Popups':>8} {'Legacy':>12} {'NumPy':>12} {'Speedup':>8}")
+    for count in POPUPS:
+        legacy, geometries = open_popups(count)
+        legacy_rate = rate(lambda: legacy_choose_cell(legacy, monitor, *POPUP_SIZE), duration)
+
+        # The arrays are rebuilt for every placement, as a popup is added each time
+        def place() -> None:
+            geometries.arrays.clear()
+            choose_cell(geometries, monitor, *POPUP_SIZE)
+
+        numpy_rate = rate(place, duration)
+        print(f"{count:>8} {legacy_rate:>12.1f} {numpy_rate:>12.1f} {numpy_rate / legacy_rate:>7.0f}x")
+        results[str(count)] = {"popups": count, "legacy_per_second": legacy_rate, "numpy_per_second": numpy_rate}
+
+    return results
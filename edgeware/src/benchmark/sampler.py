@@ -0,0 +1,84 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import random
+from pathlib import Path
+
+from pack.data import MoodSet
+from pack.sampler import RecencySampler
+
+from benchmark import rate
+
+SIZES = [1_000, 10_000, 50_000]
+MOODS = 20
+
+
+class LegacySampler:
+    """Pack.random_media before RecencySampler, kept for comparison"""
+
+    def __init__(self, media_list: list[Path], media_moods: dict[str, str]) -> None:
+        self.media_list = media_list
+        self.media_moods = media_moods
+        self.media_ranks = {}
+
+    def choose(self, active_moods: MoodSet) -> Path | None:
+        filtered = list(filter(lambda media: self.media_moods.get(media.name) in active_moods, self.media_list))
+        if not filtered:
+            return None
+
+        max_rank = len(self.media_list)
+        ranks = [self.media_ranks.get(media, max_rank) for media in filtered]
+        weights = [2 ** (16 * rank / max_rank) for rank in ranks]
+        media = random.choices(filtered, weights, k=1)[0]
+
+        for key, value in self.media_ranks.items():
+            self.media_ranks[key] = min(value + 1, max_rank)
+        self.media_ranks[media] = 1
+
+        return media
+
+
+def run(duration: float) -> dict:
+    results = {}
+    moods = [f"mood{n}" for n in range(MOODS)]
+    active_moods = MoodSet(moods[: MOODS // 2])
+
+    print(f"Picks per second with {MOODS // 2} of {MOODS} moods active")
+    print(f"{'Media':>8} {'Legacy':>12} {'Fenwick':>12} {'Speedup':>8}")
+    for size in SIZES:
+        media_list = [Path(f"image{n}.png") for n in range(size)]
+        media_moods = {media.name: random.choice(moods) for media in media_list}
+
+        buckets = {}
+        for i, media in enumerate(media_list):
+            buckets.setdefault(media_moods.get(media.name), []).append(i)
+        sampler = RecencySampler(buckets)
+
+        # Warm up so that the legacy ranks are fully populated
+        legacy = LegacySampler(media_list, media_moods)
+        for n in range(size):
+            sampler.choose(active_moods)
+        for n in range(min(size, 1000)):
+            legacy.choose(active_moods)
+
+        legacy_rate = rate(lambda: legacy.choose(active_moods), duration)
+        fenwick_rate = rate(lambda: media_list[sampler.choose(active_moods)], duration)
+        print(f"{size:>8} {legacy_rate:>12.0f} {fenwick_rate:>12.0f} {fenwick_rate / legacy_rate:>7.0f}x")
+        results[str(size)] = {"media": size, "legacy_per_second": legacy_rate, "fenwick_per_second": fenwick_rate}
+
+    return results
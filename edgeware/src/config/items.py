@@ -208,6 +208,7 @@ CONFIG_ITEMS = {
     # Booru
     "booru_download": Item("downloadEnabled", BOOLEAN, BooleanVar, bool),
     "booru_tags": Item("tagList", STRING, None, lambda value: value.replace(">", " ")),
+    "booru_url": Item("booruUrl", STRING, StringVar, lambda value: value.rstrip("/")),
     # "min_score": Item("booruMinScore", Schema(int), IntVar, int),  # TODO: Unimplemented
 
     # Dangerous
@@ -256,6 +257,8 @@ CONFIG_ITEMS = {
     "toggle_internet": Item("toggleInternet", BOOLEAN, BooleanVar, None, block=True),
     "mpv_subprocess": Item("mpvSubprocess", BOOLEAN, BooleanVar, bool, block=True),
     "video_hardware_acceleration": Item("videoHardwareAcceleration", BOOLEAN, BooleanVar, bool),
+    "parallel_media_scan": Item("parallelMediaScan", BOOLEAN, BooleanVar, bool, block=True),
+    "window_pool_size": Item("windowPoolSize", NONNEGATIVE, IntVar, int, block=True),
     "panic_key": Item("panicButton", STRING, StringVar, str, block=True),
 }
 # fmt: on
@@ -63,7 +63,7 @@ from config.window.widgets.layout import ConfigMessage
 
 config["wallpaperDat"] = ast.literal_eval(config["wallpaperDat"])
 default_config = load_default_config()
-pack = Pack(Data.PACKS / config["packPath"] if config["packPath"] else DEFAULT_PACK_PATH)
+pack = Pack(Data.PACKS / config["packPath"] if config["packPath"] else DEFAULT_PACK_PATH, config["parallelMediaScan"])
 
 
 pil_logger = logging.getLogger("PIL")
@@ -202,14 +202,15 @@ def switch_pack(vars: Vars, pack: str) -> None:
 
 def import_window(parent: Tk) -> None:
     root = Toplevel(parent)
-    root.geometry("350x225")
+    root.geometry("350x300")
     root.resizable(False, True)
     root.focus_force()
     root.title("Import New Pack")
 
-    message = "Would you like to import a new pack, or change the default pack instead?\n\nImporting a new pack saves it to /data/packs, and allows fast switching between all packs saved this way.\n\nChanging the default pack saves it to /resource, overwriting any pack previously saved there.\n"
+    message = "Would you like to import a new pack, or change the default pack instead?\n\nImporting a new pack saves it to /data/packs, and allows fast switching between all packs saved this way.\n\nImporting as zip keeps the pack zipped in /data/packs and runs it without extracting.\n\nChanging the default pack saves it to /resource, overwriting any pack previously saved there.\n"
     Label(root, text=message, wraplength=325).pack(fill="x")
     Button(root, text="Import New", command=lambda: import_pack(False)).pack()
+    Button(root, text="Import as Zip", command=lambda: import_pack(False, extract=False)).pack()
     Button(root, text="Change Default", command=lambda: import_pack(True)).pack()
     Button(root, text="Cancel", command=lambda: root.destroy()).pack()
     root.mainloop()
@@ -26,7 +26,7 @@ from paths import DEFAULT_PACK_PATH, Data, PackPaths
 from config.window.utils import confirm_overwrite, refresh
 
 
-def import_pack(default: bool) -> None:
+def import_pack(default: bool, extract: bool = True) -> None:
     pack_zip = filedialog.askopenfile("r", defaultextension=".zip")
     if not pack_zip:
         return
@@ -36,6 +36,10 @@ def import_pack(default: bool) -> None:
         return
 
     pack_name = Path(pack_zip.name).with_suffix("").name
+    if not extract:
+        import_zip(Path(pack_zip.name), Data.PACKS / f"{pack_name}.zip")
+        return
+
     import_location = DEFAULT_PACK_PATH if default else Data.PACKS / pack_name
 
     if not confirm_overwrite(import_location):
@@ -55,7 +59,7 @@ def import_pack(default: bool) -> None:
     # one subdirectory exists, move all files from the subdirectory one level
     # up and check if pack files exist again.
     pack_paths = PackPaths(import_location)
-    check_vars = [var for var in vars(pack_paths) if var not in ["root", "splash"]]
+    check_vars = [var for var in vars(pack_paths) if var not in ["root", "splash", "archive"]]
     paths_exist = lambda: any(getattr(pack_paths, var).exists() for var in check_vars)  # noqa: E731
     failure = lambda: messagebox.showerror("Error", "Pack appears to be incorrectly packaged, unable to recover.")  # noqa: E731
 
@@ -80,3 +84,28 @@ def import_pack(default: bool) -> None:
 
     messagebox.showinfo("Done", f'Pack imported to "{import_location}". Refreshing config window.')
     refresh()
+
+
+def import_zip(pack_zip: Path, import_location: Path) -> None:
+    # Packs are run from the zip file itself, which handles a single top
+    # directory the same way as extracting does
+    try:
+        pack_paths = PackPaths(pack_zip)
+    except (OSError, zipfile.BadZipFile) as e:
+        messagebox.showerror("Error", f"Unable to read pack zip file. Reason: {e}")
+        return
+
+    check_vars = [var for var in vars(pack_paths) if var not in ["root", "splash", "archive"]]
+    if not any(pack_paths.is_file(getattr(pack_paths, var)) or pack_paths.is_dir(getattr(pack_paths, var)) for var in check_vars):
+        messagebox.showerror("Error", "Pack appears to be incorrectly packaged, unable to recover.")
+        return
+
+    if not confirm_overwrite(import_location):
+        messagebox.showinfo("Cancelled", "Pack import cancelled.")
+        return
+
+    import_location.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(pack_zip, import_location)
+
+    messagebox.showinfo("Done", f'Pack imported to "{import_location}". Refreshing config window.')
+    refresh()
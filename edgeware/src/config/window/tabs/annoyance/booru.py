@@ -18,6 +18,8 @@
 from tkinter import (
     SINGLE,
     Button,
+    Entry,
+    Label,
     Listbox,
 )
 
@@ -45,6 +47,11 @@ class BooruTab(ScrollFrame):
         download_row.pack()
         ConfigToggle(download_row, "Download from Booru", variable=vars.booru_download).pack()
 
+        url_row = ConfigRow(download_section)
+        url_row.pack()
+        Label(url_row, text="Booru URL").pack(padx=PAD, side="left")
+        Entry(url_row, textvariable=vars.booru_url).pack(padx=PAD, fill="x", expand=1, side="left")
+
         tag_row = ConfigRow(download_section)
         tag_row.pack()
 
@@ -67,4 +74,5 @@ class BooruTab(ScrollFrame):
         # min_score_slider = Scale(booru_frame, from_=-50, to=100, orient="horizontal", variable=vars.min_score, label="Minimum Score")
         # min_score_slider.pack(fill="x")
 
+        set_enabled_when(url_row, enabled=(vars.booru_download, True))
         set_enabled_when(tag_row, enabled=(vars.booru_download, True))
@@ -16,7 +16,6 @@
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
-import os
 from tkinter import SINGLE, Button, Frame, IntVar, Label, Listbox, Scale, filedialog, messagebox, simpledialog
 
 from config.vars import Vars
@@ -149,7 +148,7 @@ class WallpaperTab(ScrollFrame):
                     self.wallpaper_list.delete(1)
                 except Exception:
                     break
-            for file in os.listdir(self.pack.paths.root):
+            for file in self.pack.paths.list_files(self.pack.paths.root):
                 if (file.endswith(".png") or file.endswith(".jpg") or file.endswith(".jpeg")) and file != "wallpaper.png":
                     name_ = file.split(".")[0]
                     self.wallpaper_list.insert(1, name_)
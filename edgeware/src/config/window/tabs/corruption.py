@@ -15,7 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
-import os
 from tkinter import (
     GROOVE,
     Button,
@@ -62,7 +61,7 @@ class CorruptionModeTab(ScrollFrame):
             ' folder. Over time moods will "unlock", leading to new things you haven\'t seen before the longer you use'
             ' Edgeware. For more information, check out the "Tutorial" tab.',
         )
-        set_widget_states(os.path.isfile(pack.paths.corruption), [corruption_toggle])
+        set_widget_states(pack.paths.is_file(pack.paths.corruption), [corruption_toggle])
         full_permission_toggle = ConfigToggle(corruption_start_row, "Full Permissions Mode", variable=vars.corruption_full, cursor="question_arrow")
         full_permission_toggle.pack()
         CreateToolTip(
@@ -84,8 +84,8 @@ class InfoTab(ScrollFrame):
         status_frame = Frame(stats_section, borderwidth=3, relief=GROOVE)
         status_frame.pack(fill="x")
         StatusItem(status_frame, "Pack Loaded", pack.paths.root.exists())
-        StatusItem(status_frame, "Info File", pack.paths.info.is_file())
-        StatusItem(status_frame, "Pack has Wallpaper", pack.paths.wallpaper.is_file())
+        StatusItem(status_frame, "Info File", pack.paths.is_file(pack.paths.info))
+        StatusItem(status_frame, "Pack has Wallpaper", pack.paths.is_file(pack.paths.wallpaper))
         StatusItem(
             status_frame,
             "Custom Startup",
@@ -94,11 +94,11 @@ class InfoTab(ScrollFrame):
             ' put the desired file in /resource/ and name it "loading_splash.png"'
             " (also supports .gif, .bmp and .jpg/jpeg).",
         )
-        StatusItem(status_frame, "Custom Discord Status", pack.paths.discord.is_file())
+        StatusItem(status_frame, "Custom Discord Status", pack.paths.is_file(pack.paths.discord))
         StatusItem(
             status_frame,
             "Custom Icon",
-            pack.paths.icon.is_file(),
+            pack.paths.is_file(pack.paths.icon),
             "If you are looking to add this to packs made before Edgeware++,"
             ' put the desired file in /resource/ and name it "icon.ico". (the file must be'
             " a .ico file! make sure you convert properly!)",
@@ -106,7 +106,7 @@ class InfoTab(ScrollFrame):
         StatusItem(
             status_frame,
             "Corruption",
-            pack.paths.corruption.is_file(),
+            pack.paths.is_file(pack.paths.corruption),
             "An Edgeware++ feature that is kind of hard to describe in a single tooltip.\n\n"
             'For more information, check the "About" tab for a detailed writeup.',
         )
@@ -171,7 +171,7 @@ class InfoTab(ScrollFrame):
         version_label = Label(version_frame, text=pack.info.version)
         version_label.pack(padx=2, pady=2, side="left")
 
-        set_widget_states(pack.paths.info.is_file(), [description_frame, name_frame, creator_frame, version_frame])
+        set_widget_states(pack.paths.is_file(pack.paths.info), [description_frame, name_frame, creator_frame, version_frame])
 
         discord_section = ConfigSection(self.viewPort, "Discord Information", DISCORD_TEXT)
         discord_section.pack()
@@ -197,4 +197,4 @@ class InfoTab(ScrollFrame):
             "packs that tap in to the same image IDs.",
         )
 
-        set_widget_states(pack.paths.discord.is_file(), [discord_frame])
+        set_widget_states(pack.paths.is_file(pack.paths.discord), [discord_frame])
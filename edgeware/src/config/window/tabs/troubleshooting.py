@@ -31,6 +31,7 @@ from config.vars import Vars
 from config.window.utils import log_file, request_legacy_panic_key
 from config.window.widgets.layout import (
     ConfigRow,
+    ConfigScale,
     ConfigSection,
     ConfigToggle,
 )
@@ -113,7 +114,7 @@ class TroubleshootingTab(ScrollFrame):
         CreateToolTip(
             mpv_subprocess_toggle,
             "By default, the video player of Edgeware++, mpv, is ran in a subprocess to fix a crash resulting from an X error when a popup"
-            " embedding mpv is closed. But this may result in slightly longer load times for videos and animated GIFs.\n\n"
+            " embedding mpv is closed. But this may result in slightly longer load times for videos.\n\n"
             "You can disable this setting to run mpv in the main process at the risk of an inconsistent experience and crashes.\n\n"
             "This setting is only available on Linux.",
         )
@@ -126,6 +127,27 @@ class TroubleshootingTab(ScrollFrame):
             hardware_acceleration_toggle, "Disabling hardware acceleration may increase CPU usage, but it can provide a more consistent and stable experience."
         )
 
+        parallel_scan_toggle = ConfigToggle(troubleshooting_row, "Scan Pack Media in Parallel", variable=vars.parallel_media_scan, cursor="question_arrow")
+        parallel_scan_toggle.grid(2, 1)
+        CreateToolTip(
+            parallel_scan_toggle,
+            "When loading a pack, Edgeware++ checks every new or changed file in it to find out if it's an image, video or audio file. By default, many"
+            " files are checked at once, which is much faster for large packs and packs stored on slow or network drives.\n\n"
+            "If loading your pack causes problems with your drive, you can disable this setting to check files one at a time. The time it took to scan"
+            " the pack is written to the log either way.",
+        )
+
+        window_pool_row = ConfigRow(troubleshooting_section)
+        window_pool_row.pack()
+        window_pool_scale = ConfigScale(window_pool_row, "Reused Popup Windows", vars.window_pool_size, 0, 50)
+        window_pool_scale.pack()
+        CreateToolTip(
+            window_pool_scale,
+            "Closed popup windows are hidden and reused by the next popups instead of being destroyed, which is faster than creating new windows."
+            " This sets how many hidden windows of each kind are kept at most.\n\n"
+            "Set it to 0 if reused windows cause problems on your desktop environment.",
+        )
+
         # Legacy
         legacy_section = ConfigSection(self.viewPort, "Legacy")
         legacy_section.pack()
@@ -0,0 +1,219 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from collections import OrderedDict
+from pathlib import Path
+from tkinter import Label
+
+from animation import FrameScheduler
+from paths import PackPaths
+from PIL import Image, ImageFilter, ImageOps, ImageTk
+
+# Decoded frames are kept in a shared cache, evicting the least recently used
+# animations once it grows past this size
+FRAME_CACHE_SIZE = 256 * 1024**2  # Bytes
+
+# Animations whose decoded frames would be larger than this aren't kept, their
+# frames are decoded again on every loop instead
+MAX_ANIMATION_SIZE = 64 * 1024**2  # Bytes
+
+# Like browsers, frames without a usable duration are shown for this long
+DEFAULT_FRAME_DURATION = 0.1  # Seconds
+MIN_FRAME_DURATION = 0.02  # Seconds
+
+# Hypno overlays are composited at most at this rate
+HYPNO_FRAME_RATE = 15  # Frames per second
+
+
+class Frames:
+    """
+    Frames of an animation resized to cover one target size, decoded the first
+    time they are needed so that playback can start before the whole file has
+    been decoded. Frames are kept either as Tk images to be shown directly, or
+    as PIL images to be composited. Animations larger than MAX_ANIMATION_SIZE
+    keep only the last decoded frame, and can't be shared between popups.
+    """
+
+    def __init__(self, paths: PackPaths, media: Path, size: tuple[int, int], blur: float = 0, tk: bool = True) -> None:
+        self.size = size
+        self.blur = blur
+        self.tk = tk
+        self.file = paths.open(media, "rb")
+        self.source = Image.open(self.file)
+        self.count = getattr(self.source, "n_frames", 1)
+        self.keep = self.count * self.frame_bytes() <= MAX_ANIMATION_SIZE
+
+        self.images: list[Image.Image | None] = [None] * self.count
+        self.photos: list[ImageTk.PhotoImage | None] = [None] * self.count
+        self.durations: list[float | None] = [None] * self.count
+        self.decoded = 0  # Frames kept so far, the file is closed once all are
+        self.last: tuple[int, Image.Image] | None = None  # Last decoded frame, if frames aren't kept
+
+        self.users = 0  # Animated images showing these frames
+        self.cached = False  # Whether the frame cache holds these frames
+
+    def frame_bytes(self) -> int:
+        return self.size[0] * self.size[1] * 4
+
+    def bytes(self) -> int:
+        # Size once every frame has been decoded
+        return self.count * self.frame_bytes() if self.keep else 0
+
+    def decode(self, i: int) -> None:
+        if self.images[i] is not None or self.photos[i] is not None or (self.last and self.last[0] == i):
+            return
+
+        self.source.seek(i)
+        image = ImageOps.fit(self.source.convert("RGBA"), self.size, Image.BILINEAR)
+        if self.blur:
+            image = image.filter(ImageFilter.GaussianBlur(self.blur))
+
+        duration = self.source.info.get("duration", 0) / 1000
+        self.durations[i] = duration if duration >= MIN_FRAME_DURATION else DEFAULT_FRAME_DURATION
+
+        if not self.keep:
+            self.last = (i, image)
+            return
+
+        if self.tk:
+            self.photos[i] = ImageTk.PhotoImage(image)
+        else:
+            self.images[i] = image
+        self.decoded += 1
+        if self.decoded == self.count:
+            self.close()
+
+    def image(self, i: int) -> Image.Image:
+        self.decode(i)
+        return self.images[i] if self.images[i] is not None else self.last[1]
+
+    def photo(self, i: int) -> ImageTk.PhotoImage:
+        self.decode(i)
+        return self.photos[i] if self.photos[i] is not None else ImageTk.PhotoImage(self.last[1])
+
+    def duration(self, i: int) -> float:
+        if self.durations[i] is None:
+            self.decode(i)
+        return self.durations[i]
+
+    def acquire(self) -> None:
+        self.users += 1
+
+    def release(self) -> None:
+        self.users -= 1
+        if not self.users and not self.cached:
+            self.close()
+
+    def close(self) -> None:
+        self.source.close()
+        self.file.close()
+
+
+class FrameCache:
+    """
+    Animations shared between popups, keyed by media, target size, blur and
+    how the frames are kept. Animations are counted at the size of all their
+    frames, so the cache stays within its limit while they are decoded.
+    Evicted animations are closed once no popup shows them. Only used from
+    the Tk thread.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.animations: OrderedDict[tuple[Path, tuple[int, int], float, bool], Frames] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, paths: PackPaths, media: Path, size: tuple[int, int], blur: float = 0, tk: bool = True) -> Frames:
+        key = (media, size, blur, tk)
+        frames = self.animations.get(key)
+        if frames:
+            self.hits += 1
+            self.animations.move_to_end(key)
+            return frames
+
+        self.misses += 1
+        frames = Frames(paths, media, size, blur, tk)
+        if frames.keep:
+            self.trim(self.limit - frames.bytes())
+            frames.cached = True
+            self.animations[key] = frames
+        return frames
+
+    def trim(self, limit: int) -> None:
+        total = sum(frames.bytes() for frames in self.animations.values())
+        while self.animations and total > limit:
+            _, frames = self.animations.popitem(last=False)
+            total -= frames.bytes()
+            frames.cached = False
+            if not frames.users:
+                frames.close()
+
+
+frame_cache = FrameCache(FRAME_CACHE_SIZE)
+
+
+class AnimatedImage:
+    """
+    Plays frames on a label at their own timing, driven by the frame
+    scheduler. With an overlay, each frame is composited below it at no more
+    than the given frame rate.
+    """
+
+    def __init__(self, label: Label, frames: Frames, overlay: Image.Image | None = None, frame_rate: float | None = None) -> None:
+        self.label = label
+        self.frames = frames
+        self.overlay = overlay
+        self.interval = 1 / frame_rate if frame_rate else 0
+        self.index = 0
+        self.elapsed = 0.0  # Time the current frame has been shown for
+        self.since_render = 0.0
+        self.dirty = False  # Whether the current frame has been skipped by the frame rate limit
+
+        frames.acquire()
+        width, height = frames.size
+        self.photo = ImageTk.PhotoImage("RGBA", frames.size, master=label) if overlay else None
+        self.label.config(width=width, height=height)
+        self.render()
+
+        self.handle = FrameScheduler.of(label).add(self.advance) if frames.count > 1 else None
+
+    def render(self) -> None:
+        if self.overlay:
+            self.photo.paste(Image.alpha_composite(self.frames.image(self.index), self.overlay))
+            self.label.config(image=self.photo)
+        else:
+            self.label.config(image=self.frames.photo(self.index))
+        self.since_render = 0.0
+        self.dirty = False
+
+    def advance(self, step: float) -> bool:
+        self.elapsed += step
+        self.since_render += step
+        while self.elapsed >= self.frames.duration(self.index):
+            self.elapsed -= self.frames.duration(self.index)
+            self.index = (self.index + 1) % self.frames.count
+            self.dirty = True
+
+        if self.dirty and self.since_render >= self.interval:
+            self.render()
+        return True
+
+    def stop(self) -> None:
+        FrameScheduler.of(self.label).remove(self.handle)
+        self.frames.release()
@@ -0,0 +1,157 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import os
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from threading import Condition, Thread
+from urllib.parse import urlsplit
+
+import requests
+from config.settings import Settings
+from paths import Data
+from PIL import Image
+
+# Downloaded images are kept on disk until shown, up to these bounds
+BOORU_POOL_COUNT = 8
+BOORU_POOL_BYTES = 64 * 1024**2
+
+# Number of posts requested per search
+BOORU_BATCH = 20
+
+BOORU_TIMEOUT = 10  # Seconds
+
+# Interval at which failed requests are retried
+RETRY_INTERVAL = 30  # Seconds
+
+IMAGE_SUFFIXES = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
+
+
+class BooruPrefetcher:
+    """
+    Downloads images from a Gelbooru compatible booru on a background thread,
+    reusing one connection. Popups take a downloaded image if there is one and
+    use pack media otherwise, so the Tk thread never waits for the network.
+    """
+
+    def __init__(self, settings: Settings, dir: Path | None = None) -> None:
+        self.url = settings.booru_url
+        self.tags = "" if settings.booru_tags == "all" else settings.booru_tags
+        self.dir = dir or Data.BOORU_CACHE
+        self.session = requests.Session()
+
+        self.pool: deque[tuple[Path, int]] = deque()  # (file, size) in download order
+        self.bytes = 0
+        self.posts: deque[str] = deque()  # File URLs found but not downloaded yet
+        self.condition = Condition()
+        self.failed = False
+
+        # Images downloaded on a previous launch are shown first
+        try:
+            with os.scandir(self.dir) as it:
+                files = sorted((entry for entry in it if entry.is_file() and not entry.name.startswith(".")), key=lambda entry: entry.stat().st_mtime_ns)
+            for entry in files:
+                self.pool.append((Path(entry.path), entry.stat().st_size))
+                self.bytes += entry.stat().st_size
+        except FileNotFoundError:
+            pass
+
+    def full(self) -> bool:
+        return len(self.pool) >= BOORU_POOL_COUNT or self.bytes >= BOORU_POOL_BYTES
+
+    def start(self) -> None:
+        Thread(target=self.run, name="booru-prefetch", daemon=True).start()
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: not self.full())
+
+            try:
+                if not self.posts:
+                    self.search()
+                if self.posts:
+                    self.download(self.posts.popleft())
+                else:
+                    logging.warning(f'No results for tags "{self.tags}" on {self.url}.')
+                    time.sleep(RETRY_INTERVAL)
+                self.failed = False
+            except (requests.RequestException, OSError, ValueError) as e:
+                # Only logged once until a request succeeds again
+                if not self.failed:
+                    logging.warning(f"Booru download failed. Reason: {e}")
+                self.failed = True
+                time.sleep(RETRY_INTERVAL)
+
+    def search(self) -> None:
+        params = {"page": "dapi", "s": "post", "q": "index", "json": 1, "limit": BOORU_BATCH, "tags": f"{self.tags} sort:random".strip()}
+        response = self.session.get(f"{self.url}/index.php", params=params, timeout=BOORU_TIMEOUT)
+        response.raise_for_status()
+
+        # Newer versions of Gelbooru wrap the posts in an object
+        data = response.json() if response.content else []
+        posts = data.get("post", []) if isinstance(data, dict) else data
+        for post in posts:
+            url = post.get("file_url")
+            if url and Path(urlsplit(url).path).suffix.lower() in IMAGE_SUFFIXES:
+                self.posts.append(url)
+
+    def download(self, url: str) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        suffix = Path(urlsplit(url).path).suffix.lower()
+        fd, temp = tempfile.mkstemp(dir=self.dir, prefix=".", suffix=suffix)
+        try:
+            size = 0
+            with os.fdopen(fd, "wb") as f, self.session.get(url, stream=True, timeout=BOORU_TIMEOUT) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(64 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+                    if size > BOORU_POOL_BYTES:
+                        raise ValueError(f"{url} is larger than the booru pool")
+
+            file = Path(temp).with_name(Path(temp).name[1:])
+            os.replace(temp, file)
+        except BaseException:
+            Path(temp).unlink(missing_ok=True)
+            raise
+
+        with self.condition:
+            self.pool.append((file, size))
+            self.bytes += size
+
+    def take(self) -> Image.Image | None:
+        # Images are removed from disk once taken, a broken one is skipped
+        while True:
+            with self.condition:
+                if not self.pool:
+                    return None
+                file, size = self.pool.popleft()
+                self.bytes -= size
+                self.condition.notify()
+
+            try:
+                with Image.open(file) as image:
+                    image.load()
+                return image
+            except OSError as e:
+                logging.warning(f"Failed to open booru image {file.name}. Reason: {e}")
+            finally:
+                file.unlink(missing_ok=True)
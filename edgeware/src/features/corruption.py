@@ -69,7 +69,7 @@ def apply_corruption_level(settings: Settings, pack: Pack, state: State) -> None
     level = pack.corruption_levels[state.corruption_level - 1]
 
     if settings.corruption_wallpaper:
-        os_utils.set_wallpaper(pack.paths.root / (level.wallpaper or pack.wallpaper))
+        os_utils.set_wallpaper(pack.paths.local(pack.paths.root / (level.wallpaper or pack.wallpaper)))
 
     if settings.corruption_full:
         for key, value in level.config.items():
@@ -60,7 +60,8 @@ def fill_drive(root: Tk, settings: Settings, pack: Pack, state: State) -> None:
             file = hashlib.md5((str(time.time()) + str(image.absolute())).encode()).hexdigest()
             location = path / (file + image.suffix)
 
-            shutil.copyfile(image, location)
+            with pack.paths.open(image, "rb") as source, open(location, "wb") as destination:
+                shutil.copyfileobj(source, destination)
 
         root.after(settings.fill_delay, fill)
 
@@ -71,6 +72,9 @@ def replace_images(root: Tk, settings: Settings, pack: Pack) -> None:
     if not settings.replace_images:
         return
 
+    # Every image should be able to be used as a replacement
+    pack.ready.wait()
+
     backups = Data.BACKUPS / time.asctime()
     for path, dirs, files in os.walk(settings.drive_path):
         filter_avoid_list(settings, dirs)
@@ -90,4 +94,5 @@ def replace_images(root: Tk, settings: Settings, pack: Pack) -> None:
                 backup = backups / image.relative_to(Path(settings.drive_path))
                 backup.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copyfile(image, backup)
-                shutil.copyfile(replacement, image)
+                with pack.paths.open(replacement, "rb") as source, open(image, "wb") as destination:
+                    shutil.copyfileobj(source, destination)
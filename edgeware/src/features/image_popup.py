@@ -15,25 +15,41 @@
 # You should have received a copy of the GNU General Public License
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
-import asyncio
-import logging
-from tkinter import Label, Tk
+from tkinter import Tk
 
-import booru
-import requests
 from config.settings import Settings
+from features.animated_image import HYPNO_FRAME_RATE, AnimatedImage, frame_cache
+from features.booru_prefetch import BooruPrefetcher
+from features.image_prefetch import ImagePrefetcher
 from features.popup import Popup
-from features.video_player import VideoPlayer
 from features.sextoy import Sextoy
 from pack import Pack
+from pack.metadata import MediaInfo
 from PIL import Image, ImageTk
 from roll import roll
 from state import State
 from features.vibration_mixin import VibrationMixin
 
 class ImagePopup(Popup, VibrationMixin):
-    def __init__(self, root: Tk, settings: Settings, pack: Pack, state: State, sextoy: Sextoy) -> None:
-        self.media = pack.random_image()
+    def __init__(
+        self,
+        root: Tk,
+        settings: Settings,
+        pack: Pack,
+        state: State,
+        sextoy: Sextoy,
+        prefetcher: ImagePrefetcher | None = None,
+        booru: BooruPrefetcher | None = None,
+    ) -> None:
+        # Pack media is used if no booru image has been downloaded yet
+        booru_image = booru.take() if booru and settings.booru_download and roll(50) else None
+        self.prepared = prefetcher.take() if prefetcher and not booru_image else None
+        if self.prepared:
+            self.media = self.prepared.media
+            self.info = self.prepared.info
+        else:
+            self.media = pack.random_image()
+            self.info = pack.media_info(self.media) if self.media else None
         self.hypno = roll(settings.hypno_chance)
         self.sextoy = sextoy
         if not self.should_init(settings, state):
@@ -41,47 +57,51 @@ class ImagePopup(Popup, VibrationMixin):
         
         VibrationMixin.__init__(self)
 
-        super().__init__(root, settings, pack, state)
+        super().__init__(root, settings, pack, state, self.prepared.denial if self.prepared else None)
+
+        # Booru images are always shown as static images
+        image = booru_image
+        if image:
+            self.info = MediaInfo(image.width, image.height)
 
-        # TODO: Better booru integration
-        if self.settings.booru_download and roll(50):
-            try:
-                gel = booru.Gelbooru()
-                result = booru.resolve(asyncio.run(gel.search_image(query=self.settings.booru_tags, limit=1)))
-                data = requests.get(result[0], stream=True)
-                image = Image.open(data.raw)
-            except KeyError:
-                logging.error(f'No results for tags "{self.settings.booru_tags}" on Gelbooru')
-                image = Image.open(self.media)
+        if self.prepared:
+            self.monitor = self.prepared.monitor
+            self.width, self.height = self.prepared.width, self.prepared.height
+            self.compute_position()
         else:
-            image = Image.open(self.media)
-        self.compute_geometry(image.width, image.height)
+            self.compute_geometry(self.info.width, self.info.height)
 
         # Static          -> image
-        # Static,   hypno -> image overlay, mpv
-        # Animated        -> mpv
-        # Animated, hypnp -> mpv, ?
+        # Static,   hypno -> image composited over the hypno animation
+        # Animated        -> animation
+        # Animated, hypno -> animation, hypno isn't shown
 
-        if getattr(image, "n_frames", 0) > 1:
-            self.player = VideoPlayer(self, self.settings, self.width, self.height)
-            self.player.properties["vf"] = self.try_denial_filter(True)
-            self.player.play(str(self.media))
+        if self.info.animated:
+            blur = self.try_denial_filter(False)
+            frames = frame_cache.get(self.pack.paths, self.media, (self.width, self.height), blur.radius if blur else 0)
+            self.animation = AnimatedImage(self.window.image, frames)
+            self.window.image.pack()
         else:
-            resized = image.resize((self.width, self.height), Image.LANCZOS).convert("RGBA")
-            filter = self.try_denial_filter(False)
-            final = resized.filter(filter) if filter else resized
+            if self.prepared:
+                final = self.prepared.image
+            else:
+                # Static pack images are only decoded once they are known to be
+                # shown this way, from a downscaled variant if there is one
+                limit = max(self.monitor.width, self.monitor.height)
+                image = image or self.pack.scaled.open(self.media, (self.info.width, self.info.height), (self.width, self.height), limit)
+                resized = image.resize((self.width, self.height), Image.LANCZOS).convert("RGBA")
+                filter = self.try_denial_filter(False)
+                final = resized.filter(filter) if filter else resized
 
             if self.hypno:
-                self.player = VideoPlayer(self, self.settings, self.width, self.height)
-                self.player.properties["video-scale-x"] = max(self.width / self.height, 1)
-                self.player.properties["video-scale-y"] = max(self.height / self.width, 1)
                 final.putalpha(int((1 - self.settings.hypno_opacity) * 255))
-                self.player.play(self.pack.random_hypno(), final)
+                frames = frame_cache.get(self.pack.paths, self.pack.random_hypno(), (self.width, self.height), tk=False)
+                self.animation = AnimatedImage(self.window.image, frames, final, HYPNO_FRAME_RATE)
+                self.window.image.pack()
             else:
-                label = Label(self, width=self.width, height=self.height)
-                label.pack()
-                self.photo_image = ImageTk.PhotoImage(final)
-                label.config(image=self.photo_image)
+                self.photo_image = self.prepared.photo if self.prepared and self.prepared.photo else ImageTk.PhotoImage(final)
+                self.window.image.config(image=self.photo_image, width=self.width, height=self.height)
+                self.window.image.pack()
 
         try:
             self.trigger_vibration("image_open", getattr(self.settings, 'sextoys', {}), self.sextoy)
@@ -92,13 +112,15 @@ class ImagePopup(Popup, VibrationMixin):
         self.init_finish()
 
     def should_init(self, settings: Settings, state: State) -> bool:
-        return self.media
+        return self.media and self.info
 
     def close(self) -> None:
+        if self.closed:
+            return
         try:
             self.trigger_vibration("image_close", getattr(self.settings, 'sextoys', {}), self.sextoy)
         except Exception as e:
             print(f"Image close vibration error: {str(e)}")
-        if hasattr(self, "player"):
-            self.player.close()
+        if hasattr(self, "animation"):
+            self.animation.stop()
         super().close()
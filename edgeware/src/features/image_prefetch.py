@@ -0,0 +1,143 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Condition, Thread
+from tkinter import Tk
+
+import utils
+from config.settings import Settings
+from features.popup import denial_filter, popup_size
+from pack import Pack
+from pack.metadata import MediaInfo
+from PIL import Image, ImageTk
+from roll import roll
+from screeninfo import Monitor
+
+# Number of image popups kept ready ahead of time
+PREFETCH_DEPTH = 4
+
+# Interval at which prefetched images are converted for Tk, one at a time
+CONVERT_INTERVAL = 50  # Milliseconds
+
+# Interval at which preparing is retried while the pack has no usable images
+RETRY_INTERVAL = 0.5  # Seconds
+
+
+@dataclass
+class PreparedImage:
+    media: Path
+    info: MediaInfo
+    monitor: Monitor
+    width: int
+    height: int
+    denial: bool
+    image: Image.Image | None  # Resized and filtered, None if animated
+    photo: ImageTk.PhotoImage | None = None  # Created on the Tk thread
+
+
+class ImagePrefetcher:
+    """
+    Keeps the next few image popups selected, decoded, resized and filtered
+    ahead of time on a background thread, so that showing one only requires
+    creating its window on the Tk thread. Popups that find the queue empty
+    prepare themselves as before, counted as misses.
+    """
+
+    def __init__(self, settings: Settings, pack: Pack, capacity: int = PREFETCH_DEPTH) -> None:
+        self.settings = settings
+        self.pack = pack
+        self.capacity = capacity
+        self.queue: deque[PreparedImage] = deque()
+        self.condition = Condition()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self.queue)
+
+    def start(self, root: Tk) -> None:
+        Thread(target=self.run, name="image-prefetch", daemon=True).start()
+        self.convert(root)
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: len(self.queue) < self.capacity)
+
+            prepared = self.prepare()
+            if not prepared:
+                time.sleep(RETRY_INTERVAL)
+                continue
+
+            with self.condition:
+                self.queue.append(prepared)
+
+    def prepare(self) -> PreparedImage | None:
+        media = self.pack.random_image()
+        info = self.pack.media_info(media) if media else None
+        if not info:
+            return None
+
+        monitor = utils.random_monitor(self.settings)
+        width, height = popup_size(self.settings, monitor, info.width, info.height)
+        denial = roll(self.settings.denial_chance)
+
+        # Animated images are decoded as they are played, only their pick and size are prepared
+        image = None
+        if not info.animated:
+            try:
+                limit = max(monitor.width, monitor.height)
+                image = self.pack.scaled.open(media, (info.width, info.height), (width, height), limit)
+                image = image.resize((width, height), Image.LANCZOS).convert("RGBA")
+            except OSError as e:
+                logging.warning(f"Failed to prefetch {media.name}. Reason: {e}")
+                return None
+            if denial:
+                image = image.filter(denial_filter(False))
+
+        return PreparedImage(media, info, monitor, width, height, denial, image)
+
+    def convert(self, root: Tk) -> None:
+        # PhotoImages can only be created on the Tk thread
+        with self.condition:
+            prepared = next((prepared for prepared in self.queue if prepared.image and not prepared.photo), None)
+        if prepared:
+            prepared.photo = ImageTk.PhotoImage(prepared.image)
+
+        root.after(CONVERT_INTERVAL, lambda: self.convert(root))
+
+    def take(self) -> PreparedImage | None:
+        active_moods = self.pack.active_moods()
+        with self.condition:
+            prepared = self.queue.popleft() if self.queue else None
+            self.condition.notify()
+
+        # Picked before the active moods changed, so it may no longer be allowed
+        if prepared and self.pack.index.media_moods.get(prepared.media.name) not in active_moods:
+            prepared = None
+
+        if prepared:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return prepared
@@ -26,6 +26,7 @@ from tkinter import Tk
 import os_utils
 import pystray
 import pyglet
+from animation import Easing, Tween, TweenEngine, ease_in, ease_out
 from config.settings import Settings
 from desktop_notifier.common import Attachment, Icon
 from desktop_notifier.sync import DesktopNotifierSync
@@ -42,10 +43,8 @@ from state import State
 
 # Global list to keep active players alive
 _active_players: list[pyglet.media.Player] = []
-# Run our update ticks(fades) once in the `tickrate` milliseconds
-# This number is responsible for the smoothness of our fade_in and fade_out functions
-tickrate = 16
-tickrate_in_seconds = tickrate / 1000
+# Volume fade currently running on each player
+_volume_fades: dict[pyglet.media.Player, Tween] = {}
 
 def play_audio(root: Tk, settings: Settings, pack: Pack) -> None:
     # Clean up finished players
@@ -57,8 +56,9 @@ def play_audio(root: Tk, settings: Settings, pack: Pack) -> None:
     audio = pack.random_audio()
     if not audio:
         return
+    info = pack.media_info(audio)
 
-    path = str(audio)
+    path = str(pack.paths.local(audio))
     # Load in streaming mode to avoid loading entire file into RAM
     src = pyglet.media.load(path, streaming=True)
     player = pyglet.media.Player()
@@ -74,56 +74,54 @@ def play_audio(root: Tk, settings: Settings, pack: Pack) -> None:
     fade_in_duration = 1
     fade_out_duration = 1
     fade_in(root, player, fade_in_duration)
-    schedule_fade_out(root, player, fade_out_duration)
+    schedule_fade_out(root, player, fade_out_duration, info.duration if info else None)
 
-def fade_in(root: Tk, player: pyglet.media.Player, fade_duration: float):
-    """Gradually raise volume from 0 to the original level over `fade_duration` seconds."""
-    target = getattr(player, '_volume_target', player.volume)
-    player._volume_target = target
-    player.volume = 0.0
+def fade_volume(
+    root: Tk, player: pyglet.media.Player, start: float, end: float, fade_duration: float, easing: Easing, done: Callable[[], None] | None = None
+) -> None:
+    # A new fade replaces the one still running on the player
+    previous = _volume_fades.pop(player, None)
+    if previous:
+        previous.cancel()
 
-    steps = int(fade_duration / tickrate_in_seconds)
-    delta = target / steps if steps else target
+    def set_volume(volume: float) -> None:
+        player.volume = volume
 
-    def step(count=0):
-        new_v = player.volume + delta
-        if count >= steps or new_v >= target:
-            player.volume = target
-        else:
-            player.volume = new_v
-            root.after(tickrate, lambda: step(count+1))
+    def finish() -> None:
+        _volume_fades.pop(player, None)
+        if done:
+            done()
 
-    root.after(0, step)
+    _volume_fades[player] = TweenEngine.of(root).add(set_volume, start, end, fade_duration, easing, finish)
 
-def schedule_fade_out(root: Tk, player: pyglet.media.Player, fade_duration: float):
+def fade_in(root: Tk, player: pyglet.media.Player, fade_duration: float):
+    """Gradually raise volume from 0 to the original level over `fade_duration` seconds."""
+    target = player.volume
+    player.volume = 0.0
+    fade_volume(root, player, 0.0, target, fade_duration, ease_in)
+
+def schedule_fade_out(root: Tk, player: pyglet.media.Player, fade_duration: float, duration: float | None = None):
     """Arrange for fade-out to start `duration` seconds before playback ends."""
-    def setup():
-        length_ms = int((player.source.duration or 0) * 1000)
-        delay = length_ms - fade_duration * 1000
-        root.after(delay, lambda: fade_out(root, player, fade_duration))
+    def setup(length: float):
+        delay = int((length - fade_duration) * 1000)
+        root.after(max(delay, 0), lambda: fade_out(root, player, fade_duration))
 
-    root.after(100, setup)
+    # The duration from the metadata store is known before the source is loaded
+    if duration:
+        setup(duration)
+    else:
+        root.after(100, lambda: setup(player.source.duration or 0))
 
 def fade_out(root: Tk, player: pyglet.media.Player, fade_duration: float):
     """Smoothly lower volume to 0 over `duration` seconds, then pause the player."""
-    start_v = player.volume
-    steps = int(fade_duration / tickrate_in_seconds)
-    delta = start_v / steps if steps else start_v
-    
-    def step(count=0):
-        new_v = player.volume - delta
-        if count >= steps or new_v <= 0:
-            player.volume = 0.0
-            player.pause()
-            try:
-                _active_players.remove(player)
-            except ValueError:
-                pass
-        else:
-            player.volume = new_v
-            root.after(tickrate, lambda: step(count+1))
-
-    root.after(0, step)
+    def done() -> None:
+        player.pause()
+        try:
+            _active_players.remove(player)
+        except ValueError:
+            pass
+
+    fade_volume(root, player, player.volume, 0.0, fade_duration, ease_out, done)
 
 
 def open_web(pack: Pack) -> None:
@@ -146,7 +144,7 @@ def display_notification(settings: Settings, pack: Pack, sextoy: Sextoy) -> None
     notifier.send(
         title=pack.info.name,
         message=notification,
-        attachment=Attachment(image) if roll(settings.notification_image_chance) and image else None,
+        attachment=Attachment(pack.paths.local(image)) if roll(settings.notification_image_chance) and image else None,
     )
 
 
@@ -184,7 +182,7 @@ def handle_wallpaper(root: Tk, settings: Settings, pack: Pack, state: State) ->
             wallpapers.remove(previous)
 
         wallpaper = random.choice(wallpapers)
-        os_utils.set_wallpaper(pack.paths.root / wallpaper)
+        os_utils.set_wallpaper(pack.paths.local(pack.paths.root / wallpaper))
 
         t = settings.wallpaper_timer
         v = settings.wallpaper_variance
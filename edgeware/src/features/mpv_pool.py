@@ -0,0 +1,144 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import time
+from threading import Lock, Thread
+
+import mpv
+
+# Defaults of the properties set per popup, reset to when a reused player is
+# checked out without them
+RESET_PROPERTIES = {"vf": "", "volume": 100}
+
+# Idle players are terminated after this long
+IDLE_TIMEOUT = 60  # Seconds
+REAP_INTERVAL = 10  # Seconds
+
+
+class PooledPlayer:
+    def __init__(self, player: mpv.MPV) -> None:
+        self.player = player
+        self.applied: dict[str, object] = {}  # Properties as last set on the player
+        self.released = time.monotonic()
+
+
+class MpvPool:
+    """
+    Initialized mpv players that are embedded into a new window each time
+    they are checked out. Creating a player is the slowest part of opening a
+    video, so a few are created in advance and players are stopped instead of
+    terminated when their popup closes. Only the properties that differ from
+    the ones a player was last used with are set. At most size players are
+    kept idle, and players beyond the warm ones that stay idle for
+    IDLE_TIMEOUT are terminated.
+    """
+
+    def __init__(self, size: int, properties: dict[str, object], warm: int = 2) -> None:
+        self.size = size
+        self.properties = properties
+        self.warm = min(warm, size)
+        self.idle: list[PooledPlayer] = []
+        self.lock = Lock()
+        self.closed = False
+        self.hits = 0
+        self.misses = 0
+
+        Thread(target=self.run, name="mpv-pool", daemon=True).start()
+
+    def create(self) -> PooledPlayer:
+        pooled = PooledPlayer(mpv.MPV())
+        pooled.applied.update(RESET_PROPERTIES)  # mpv's defaults
+        self.apply(pooled, self.properties)
+        return pooled
+
+    def apply(self, pooled: PooledPlayer, properties: dict[str, object]) -> None:
+        for key, value in properties.items():
+            if key not in pooled.applied or pooled.applied[key] != value:
+                pooled.player[key] = value
+                pooled.applied[key] = value
+
+    def acquire(self, wid: int, properties: dict[str, object]) -> PooledPlayer:
+        with self.lock:
+            pooled = self.idle.pop() if self.idle else None
+
+        if pooled:
+            self.hits += 1
+        else:
+            self.misses += 1
+            pooled = self.create()
+
+        pooled.player["wid"] = wid
+        self.apply(pooled, {**RESET_PROPERTIES, **properties})
+        return pooled
+
+    def release(self, pooled: PooledPlayer) -> None:
+        try:
+            pooled.player.stop()
+        except Exception as e:
+            logging.warning(f"Failed to reset mpv player, it won't be reused. Reason: {e}")
+            self.terminate(pooled)
+            return
+
+        pooled.released = time.monotonic()
+        with self.lock:
+            if not self.closed and len(self.idle) < self.size:
+                self.idle.append(pooled)
+                return
+        self.terminate(pooled)
+
+    def terminate(self, pooled: PooledPlayer) -> None:
+        try:
+            pooled.player.terminate()
+        except Exception as e:
+            logging.warning(f"Failed to terminate mpv player. Reason: {e}")
+
+    def warm_up(self) -> None:
+        for _ in range(self.warm):
+            try:
+                pooled = self.create()
+            except Exception as e:
+                logging.warning(f"Failed to create mpv player in advance. Reason: {e}")
+                return
+
+            with self.lock:
+                kept = not self.closed and len(self.idle) < self.size
+                if kept:
+                    self.idle.append(pooled)
+            if not kept:
+                self.terminate(pooled)
+                return
+
+    def run(self) -> None:
+        self.warm_up()
+        while not self.closed:
+            time.sleep(REAP_INTERVAL)
+            now = time.monotonic()
+            with self.lock:
+                # The most recently released players are kept warm
+                reapable = self.idle[: max(len(self.idle) - self.warm, 0)]
+                expired = [pooled for pooled in reapable if now - pooled.released >= IDLE_TIMEOUT]
+                self.idle = [pooled for pooled in self.idle if pooled not in expired]
+            for pooled in expired:
+                self.terminate(pooled)
+
+    def shutdown(self) -> None:
+        with self.lock:
+            self.closed = True
+            idle, self.idle = self.idle, []
+        for pooled in idle:
+            self.terminate(pooled)
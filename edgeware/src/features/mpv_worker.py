@@ -0,0 +1,130 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import logging
+import os
+import subprocess
+import sys
+from multiprocessing.connection import Connection
+from threading import Lock, Thread
+
+from paths import Process
+
+WORKER_MODULE = "os_utils.linux_mpv_worker"
+
+# Exiting waits this long for the worker to stop its players
+SHUTDOWN_TIMEOUT = 5  # Seconds
+
+
+class MpvWorker:
+    """
+    Process hosting the mpv players of all popups when mpv runs in a
+    subprocess. It's started once and keeps a pool of players, so opening a
+    video only sends a command over a pipe instead of starting a new Python
+    interpreter. If the worker exits unexpectedly, it's started again by the
+    next command. Players are stopped without waiting for the worker, which
+    is only waited for on shutdown.
+    """
+
+    def __init__(self, properties: dict[str, object], size: int = 8) -> None:
+        self.properties = properties
+        self.size = size
+        self.process: subprocess.Popen | None = None
+        self.writer: Connection | None = None
+        self.lock = Lock()
+        self.closed = False
+        self.next_id = 0
+        self.stopping: set[int] = set()  # Ids of players the worker hasn't confirmed stopping yet
+
+    def start(self) -> None:
+        read, child_write = os.pipe()
+        child_read, write = os.pipe()
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", WORKER_MODULE, str(child_read), str(child_write)],
+            cwd=Process.ROOT,
+            pass_fds=(child_read, child_write),
+        )
+        os.close(child_read)
+        os.close(child_write)
+
+        self.writer = Connection(write, readable=False)
+        self.writer.send((self.properties, self.size))
+        Thread(target=self.listen, args=(Connection(read, writable=False),), name="mpv-worker", daemon=True).start()
+
+    def send(self, message: tuple) -> None:
+        with self.lock:
+            if self.closed:
+                return
+
+            if not self.process or self.process.poll() is not None:
+                if self.process:
+                    logging.warning(f"mpv worker exited with code {self.process.returncode}, restarting it.")
+                self.start()
+
+            try:
+                self.writer.send(message)
+            except OSError as e:
+                logging.warning(f"Failed to send {message[0]} command to mpv worker. Reason: {e}")
+
+    def listen(self, reader: Connection) -> None:
+        while True:
+            try:
+                command, player_id = reader.recv()
+            except (EOFError, OSError):
+                break
+
+            if command == "stopped":
+                with self.lock:
+                    self.stopping.discard(player_id)
+
+        # The worker exited, so nothing it was playing is left to stop
+        reader.close()
+        with self.lock:
+            self.stopping.clear()
+
+    def play(self, wid: int, properties: dict[str, object], media: str) -> int:
+        with self.lock:
+            player_id = self.next_id
+            self.next_id += 1
+
+        self.send(("play", player_id, wid, properties, media))
+        return player_id
+
+    def stop(self, player_id: int) -> None:
+        # Called on the Tk thread, so the confirmation is handled by the listener
+        with self.lock:
+            self.stopping.add(player_id)
+        self.send(("stop", player_id))
+
+    def shutdown(self) -> None:
+        with self.lock:
+            self.closed = True
+            if not self.process or self.process.poll() is not None:
+                return
+
+            try:
+                self.writer.send(("shutdown",))
+                self.writer.close()
+            except OSError:
+                pass
+
+        try:
+            self.process.wait(SHUTDOWN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logging.warning(f"mpv worker didn't shut down in time with {len(self.stopping)} players left to stop, killing it.")
+            self.process.kill()
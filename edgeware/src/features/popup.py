@@ -18,31 +18,66 @@
 import os
 import random
 import shutil
-import time
 from pathlib import Path
-from threading import Thread
-from tkinter import Button, Label, TclError, Tk, Toplevel
+from tkinter import Button, Label, Tk
 
-import os_utils
 import utils
+from animation import FrameScheduler, Tween, TweenEngine
 from config.settings import Settings
 from desktop_notifier.common import Icon
 from desktop_notifier.sync import DesktopNotifierSync
 from features.misc import mitosis_popup, open_web
+from features.window_pool import PooledWindow, WindowPool
 from pack import Pack
 from panic import panic
 from paths import Data
 from PIL import ImageFilter
+from placement import CELL_SIDE, choose_cell
 from roll import roll
+from screeninfo import Monitor
 from state import State
 
+# Popups that time out fade out over this duration
+FADE_OUT_DURATION = 1.5  # Seconds
 
-class Popup(Toplevel):
+
+def popup_size(settings: Settings, monitor: Monitor, source_width: int, source_height: int) -> tuple[int, int]:
+    source_size = max(source_width, source_height) / min(monitor.width, monitor.height)
+    target_size = (random.randint(30, 70) if not settings.lowkey_mode else random.randint(20, 50)) / 100
+    scale = target_size / source_size
+    return int(source_width * scale), int(source_height * scale)
+
+
+def denial_filter(mpv: bool) -> ImageFilter.Filter | str:
+    mpv_filters = ["gblur=sigma=5", "gblur=sigma=10", "gblur=sigma=20"]
+    image_filters = [ImageFilter.GaussianBlur(5), ImageFilter.GaussianBlur(10), ImageFilter.GaussianBlur(20)]
+    return random.choice(mpv_filters if mpv else image_filters)
+
+
+class PopupWindow(PooledWindow):
+    def __init__(self, root: Tk, settings: Settings, state: State) -> None:
+        super().__init__(root, settings)
+        self.bind("<KeyPress>", lambda event: panic(root, settings, state, condition=(event.keysym == settings.panic_key)))
+
+        # Stacked in this order, videos are lowered below all of them
+        self.image = Label(self, bd=0, bg="black")
+        self.denial = Label(self)
+        self.caption = Label(self)
+        self.button = Button(self)
+        self.keep()
+
+    def reset(self) -> None:
+        super().reset()
+        self.image.config(image="")
+
+
+class Popup:
     media: Path  # Defined by subclasses
 
-    def __init__(self, root: Tk, settings: Settings, pack: Pack, state: State) -> None:
+    def __init__(self, root: Tk, settings: Settings, pack: Pack, state: State, denial: bool | None = None) -> None:
         state.popup_number += 1
-        super().__init__(bg="black")
+        self.window = WindowPool.of(root, PopupWindow).acquire(settings, state)
+        self.closed = False
 
         self.root = root
         self.settings = settings
@@ -51,14 +86,13 @@ class Popup(Toplevel):
         self.popup_id = state.get_popup_id()
         self.theme = settings.theme
 
-        self.denial = roll(self.settings.denial_chance)
-
-        self.bind("<KeyPress>", lambda event: panic(self.root, self.settings, self.state, condition=(event.keysym == self.settings.panic_key)))
-        self.attributes("-topmost", True)
-        os_utils.set_borderless(self)
+        self.denial = roll(self.settings.denial_chance) if denial is None else denial
+        self.move_handle = None
+        self.fade: Tween | None = None
+        self.timers: list[str] = []  # Ids of the timers set on the window, cancelled on close
 
         self.opacity = self.settings.opacity
-        self.attributes("-alpha", self.opacity)
+        self.window.attributes("-alpha", self.opacity)
 
     def init_finish(self) -> None:
         self.try_denial_text()
@@ -72,14 +106,11 @@ class Popup(Toplevel):
 
     def compute_geometry(self, source_width: int, source_height: int) -> None:
         self.monitor = utils.random_monitor(self.settings)
+        self.width, self.height = popup_size(self.settings, self.monitor, source_width, source_height)
+        self.compute_position()
 
-        source_size = max(source_width, source_height) / min(self.monitor.width, self.monitor.height)
-        target_size = (random.randint(30, 70) if not self.settings.lowkey_mode else random.randint(20, 50)) / 100
-        scale = target_size / source_size
-
-        self.width = int(source_width * scale)
-        self.height = int(source_height * scale)
-
+    def compute_position(self) -> None:
+        # Requires the monitor and size to be set
         if self.settings.lowkey_mode:
             corner = self.settings.lowkey_corner
             if corner == 4:  # Random corner
@@ -90,38 +121,12 @@ class Popup(Toplevel):
             self.x = self.monitor.x + (self.monitor.width - self.width if right else 0)
             self.y = self.monitor.y + (self.monitor.height - self.height if bottom else 0)
         else:
-            positions = []
-            weights = []
-
-            # Divide the area of possible coordinates with respect to the
-            # monitor and popup sizes into a grid of side * side squares.
-            # Considering each pixel individually is unnecessary and too slow.
-            side = 50
+            # Choose one of the side * side squares that the area of possible
+            # coordinates is divided into, then a position inside it randomly
+            side = CELL_SIDE
             area_width = self.monitor.width - self.width
             area_height = self.monitor.height - self.height
-            for x_index in range(area_width // side):
-                for y_index in range(area_height // side):
-                    # Possible coordinates for this popup
-                    sx = x_index * side + self.monitor.x
-                    sy = y_index * side + self.monitor.y
-                    sw = self.width
-                    sh = self.height
-
-                    # Compute the weight for this position, preferring positions
-                    # that reduce popup overlap and clustering
-                    geometries = self.state.popup_geometries.copy().values()  # Copied in case a popup is closed during iteration
-                    weight = float("inf") if geometries else 1
-                    for w, h, x, y in geometries:
-                        intersection = max(0, min(sx + sw, x + w) - max(sx, x)) * max(0, min(sy + sh, y + h) - max(sy, y))
-                        nonoverlap = 1 - intersection / (sw * sh)
-                        distance_squared = (sx + sw / 2 - (x + w / 2)) ** 2 + (sy + sh / 2 - (y + h / 2)) ** 2
-                        weight = min(2 ** (32 * nonoverlap) + distance_squared, weight)
-
-                    positions.append((sx, sy))
-                    weights.append(weight)
-
-            # Select a position inside the chosen square randomly
-            min_x, min_y = random.choices(positions, weights)[0]
+            min_x, min_y = choose_cell(self.state.popup_geometries, self.monitor, self.width, self.height)
 
             # In case the area can't be neatly divided into squares
             max_x = min_x + side
@@ -132,25 +137,26 @@ class Popup(Toplevel):
             self.x = random.randint(min_x, max_x)
             self.y = random.randint(min_y, max_y)
 
-        self.state.popup_geometries[self.popup_id] = (self.width, self.height, self.x, self.y)
-        self.geometry(f"{self.width}x{self.height}+{self.x}+{self.y}")
+        self.state.popup_geometries.add(self.popup_id, (self.width, self.height, self.x, self.y), self.monitor)
+        self.window.geometry(f"{self.width}x{self.height}+{self.x}+{self.y}")
+        self.window.deiconify()
 
     def try_denial_filter(self, mpv: bool) -> ImageFilter.Filter | str:
-        mpv_filters = ["gblur=sigma=5", "gblur=sigma=10", "gblur=sigma=20"]
-        image_filters = [ImageFilter.GaussianBlur(5), ImageFilter.GaussianBlur(10), ImageFilter.GaussianBlur(20)]
-        return random.choice(mpv_filters if mpv else image_filters) if self.denial else ""
+        return denial_filter(mpv) if self.denial else ""
 
     def try_denial_text(self) -> None:
         if self.denial:
-            label = Label(
-                self, text=self.pack.random_denial(), wraplength=self.width, fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size)
+            label = self.window.denial
+            label.config(
+                text=self.pack.random_denial(), wraplength=self.width, fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size)
             )
             label.place(relx=0.5, rely=0.5, anchor="c")
 
     def try_caption(self) -> None:
         caption = self.pack.random_caption(self.media)
         if self.settings.captions_in_popups and caption:
-            label = Label(self, text=caption, wraplength=self.width, fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size))
+            label = self.window.caption
+            label.config(text=caption, wraplength=self.width, fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size))
             label.place(x=5, y=5)
 
     def try_corruption_dev(self) -> None:
@@ -161,10 +167,14 @@ class Popup(Toplevel):
                 if mood in level.moods:
                     levels.append(self.pack.corruption_levels.index(level) + 1)
 
-            label_mood = Label(self, text=f"Popup mood: {mood}", fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size))
-            label_level = Label(self, text=f"Valid Levels: {levels}", fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size))
+            label_mood = Label(self.window, text=f"Popup mood: {mood}", fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size))
+            label_level = Label(self.window, text=f"Valid Levels: {levels}", fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size))
             label_current_level = Label(
-                self, text=f"Current Level: {self.state.corruption_level}", fg=self.theme.fg, bg=self.theme.bg, font=(self.theme.font, self.theme.font_size)
+                self.window,
+                text=f"Current Level: {self.state.corruption_level}",
+                fg=self.theme.fg,
+                bg=self.theme.bg,
+                font=(self.theme.font, self.theme.font_size),
             )
 
             label_mood.place(x=5, y=(self.height // 2))
@@ -173,10 +183,10 @@ class Popup(Toplevel):
 
     def try_button(self) -> None:
         if self.settings.buttonless:
-            self.bind("<ButtonRelease-1>", lambda event: self.click())
+            self.window.bind_temporary("<ButtonRelease-1>", lambda event: self.click())
         else:
-            button = Button(
-                self,
+            button = self.window.button
+            button.config(
                 text=self.pack.index.default.popup_close,
                 command=self.click,
                 fg=self.theme.fg,
@@ -188,56 +198,52 @@ class Popup(Toplevel):
             button.place(x=-10, y=-10, relx=1, rely=1, anchor="se")
 
     def try_move(self) -> None:
-        def move() -> None:
-            speed_x = 0 if self.settings.moving_chance else self.settings.moving_speed
-            speed_y = 0 if self.settings.moving_chance else self.settings.moving_speed
-            while speed_x == 0 and speed_y == 0:
-                speed_x = random.randint(-self.settings.moving_speed, self.settings.moving_speed)
-                speed_y = random.randint(-self.settings.moving_speed, self.settings.moving_speed)
-
-            try:
-                while True:
-                    self.x += speed_x
-                    self.y += speed_y
-
-                    left = self.x <= self.monitor.x
-                    right = self.x + self.width >= self.monitor.x + self.monitor.width
-                    if left or right:
-                        speed_x = -speed_x
-
-                    top = self.y <= self.monitor.y
-                    bottom = self.y + self.height >= self.monitor.y + self.monitor.height
-                    if top or bottom:
-                        speed_y = -speed_y
-
-                    self.geometry(f"{self.width}x{self.height}+{self.x}+{self.y}")
-                    time.sleep(0.01)
-            except TclError:
-                pass  # Exception thrown when closing
-
-        if roll(self.settings.moving_chance):
-            Thread(target=move, daemon=True).start()
+        if not roll(self.settings.moving_chance):
+            return
+
+        speed_x = 0 if self.settings.moving_chance else self.settings.moving_speed
+        speed_y = 0 if self.settings.moving_chance else self.settings.moving_speed
+        while speed_x == 0 and speed_y == 0:
+            speed_x = random.randint(-self.settings.moving_speed, self.settings.moving_speed)
+            speed_y = random.randint(-self.settings.moving_speed, self.settings.moving_speed)
+
+        # The speed is in pixels per 10 ms
+        self.velocity = [speed_x * 100, speed_y * 100]
+        self.position = [float(self.x), float(self.y)]
+        self.move_handle = FrameScheduler.of(self.root).add(self.move)
+
+    def move(self, step: float) -> bool:
+        bounds = [(self.monitor.x, self.monitor.x + self.monitor.width - self.width), (self.monitor.y, self.monitor.y + self.monitor.height - self.height)]
+        for axis, (low, high) in enumerate(bounds):
+            self.position[axis] += self.velocity[axis] * step
+            if self.position[axis] <= low:
+                self.position[axis] = low
+                self.velocity[axis] = abs(self.velocity[axis])
+            elif self.position[axis] >= high:
+                self.position[axis] = high
+                self.velocity[axis] = -abs(self.velocity[axis])
+
+        self.x, self.y = round(self.position[0]), round(self.position[1])
+        self.window.geometry(f"{self.width}x{self.height}+{self.x}+{self.y}")
+        return True
 
     def try_multi_click(self) -> None:
         self.clicks_to_close = self.pack.random_clicks_to_close(self.media) if self.settings.multi_click_popups else 1
 
     def try_timeout(self) -> None:
-        def fade_out() -> None:
-            try:
-                while self.opacity > 0:
-                    self.opacity -= 0.01
-                    self.attributes("-alpha", self.opacity)
-                    time.sleep(0.015)
-                self.close()
-            except TclError:
-                pass  # Exception thrown when manually closed during fade out
-
         if self.settings.timeout_enabled and not self.state.pump_scare:
-            self.after(self.settings.timeout, Thread(target=fade_out, daemon=True).start)
+            self.timers.append(self.window.after(self.settings.timeout, self.fade_out))
+
+    def fade_out(self) -> None:
+        self.fade = TweenEngine.of(self.root).add(self.set_opacity, self.opacity, 0, FADE_OUT_DURATION, done=self.close)
+
+    def set_opacity(self, opacity: float) -> None:
+        self.opacity = opacity
+        self.window.attributes("-alpha", opacity)
 
     def try_pump_scare(self) -> None:
         if self.state.pump_scare:
-            self.after(2500, self.close)
+            self.timers.append(self.window.after(2500, self.close))
 
     def try_web_open(self) -> None:
         if self.settings.web_on_popup_close and roll((100 - self.settings.web_chance) / 2):
@@ -261,12 +267,24 @@ class Popup(Toplevel):
         path_blacklist = Data.BLACKLIST / "".join(self.pack.info.name.split())
         if not os.path.exists(path_blacklist):
             os.makedirs(path_blacklist)
-        shutil.move(self.media, path_blacklist)
+        # Media in archives can't be moved, it is only removed until restarting
+        if not self.pack.paths.archive:
+            shutil.move(self.media, path_blacklist)
+        self.pack.remove_media(self.media)
         notifier = DesktopNotifierSync(app_name="Edgeware++", app_icon=Icon(self.pack.icon))
         notifier.send(title=self.pack.info.name, message=f"{filename} has been successfully sent to blacklist")
 
     def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+
+        FrameScheduler.of(self.root).remove(self.move_handle)
+        if self.fade:
+            self.fade.cancel()
+        for timer in self.timers:
+            self.window.after_cancel(timer)
         self.state.popup_number -= 1
         self.state.popup_geometries.pop(self.popup_id)
         self.try_web_open()
-        self.destroy()
+        WindowPool.of(self.root, PopupWindow).release(self.window)
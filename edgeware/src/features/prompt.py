@@ -15,19 +15,33 @@
 # You should have received a copy of the GNU General Public License
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
-from tkinter import Button, Label, Text, Toplevel
+from tkinter import Button, Label, Text, Tk
 
-import os_utils
 import utils
 from config.settings import Settings
 from features.sextoy import Sextoy
 from pack import Pack
 from state import State
 from features.vibration_mixin import VibrationMixin
+from features.window_pool import PooledWindow, WindowPool
 
 
-class Prompt(Toplevel, VibrationMixin):
-    def __init__(self, settings: Settings, pack: Pack, state: State, sextoy: Sextoy) -> None:
+class PromptWindow(PooledWindow):
+    def __init__(self, root: Tk, settings: Settings) -> None:
+        super().__init__(root, settings)
+        self.heading = Label(self)
+        self.body = Label(self)
+        self.input = Text(self)
+        self.button = Button(self)
+        self.keep()
+
+    def reset(self) -> None:
+        super().reset()
+        self.input.delete(1.0, "end")
+
+
+class Prompt(VibrationMixin):
+    def __init__(self, root: Tk, settings: Settings, pack: Pack, state: State, sextoy: Sextoy) -> None:
         VibrationMixin.__init__(self)
 
         self.prompt = pack.random_prompt()
@@ -36,33 +50,35 @@ class Prompt(Toplevel, VibrationMixin):
 
         if not self.should_init():
             return
-        super().__init__()
-
-        self.attributes("-topmost", True)
-        os_utils.set_borderless(self)
-        self.configure(background=settings.theme.bg)
+        self.root = root
+        self.window = WindowPool.of(root, PromptWindow).acquire(settings)
+        self.window.configure(background=settings.theme.bg)
 
         monitor = utils.primary_monitor()
         width = monitor.width // 4
         height = monitor.height // 2
         x = monitor.x + (monitor.width - width) // 2
         y = monitor.y + (monitor.height - height) // 2
-        self.geometry(f"{width}x{height}+{x}+{y}")
+        self.window.geometry(f"{width}x{height}+{x}+{y}")
 
-        Label(
-            self,
+        self.window.heading.config(
             text="\n" + pack.index.default.prompt_command + "\n",
             fg=settings.theme.fg,
             bg=settings.theme.bg,
             font=(settings.theme.font, settings.theme.font_size),
-        ).pack()
+        )
+        self.window.heading.pack()
 
-        Label(self, text=self.prompt, wraplength=width, fg=settings.theme.fg, bg=settings.theme.bg, font=(settings.theme.font, settings.theme.font_size)).pack()
+        self.window.body.config(
+            text=self.prompt, wraplength=width, fg=settings.theme.fg, bg=settings.theme.bg, font=(settings.theme.font, settings.theme.font_size)
+        )
+        self.window.body.pack()
 
-        input = Text(self, fg=settings.theme.text_fg, bg=settings.theme.text_bg)
+        input = self.window.input
+        input.config(fg=settings.theme.text_fg, bg=settings.theme.text_bg)
         input.pack()
-        button = Button(
-            self,
+        button = self.window.button
+        button.config(
             text=pack.index.default.prompt_submit,
             command=lambda: self.submit(settings.prompt_max_mistakes, self.prompt, input.get(1.0, "end-1c")),
             fg=settings.theme.fg,
@@ -72,6 +88,7 @@ class Prompt(Toplevel, VibrationMixin):
             font=(settings.theme.font, settings.theme.font_size),
         )
         button.place(x=-10, y=-10, relx=1, rely=1, anchor="se")
+        self.window.deiconify()
 
         self.start_continuous_vibration("prompt", getattr(settings, 'sextoys', {}), sextoy)
 
@@ -101,5 +118,5 @@ class Prompt(Toplevel, VibrationMixin):
         if d[len(a)][len(b)] <= max_mistakes:
             self.stop_continuous_vibration("prompt", self.sextoy)
             self.state.prompt_active = False
-            self.destroy()
+            WindowPool.of(self.root, PromptWindow).release(self.window)
             self.state.prompt_active = False
@@ -20,14 +20,17 @@ from tkinter import Label, Toplevel
 
 import os_utils
 import utils
-from config.settings import Settings
-from features.video_player import VideoPlayer
+from animation import TweenEngine, ease_in_out
+from features.animated_image import AnimatedImage, Frames
 from pack import Pack
 from PIL import Image, ImageTk
 
+FADE_IN_DURATION = 1  # Seconds
+FADE_OUT_DURATION = 0.125  # Seconds
+
 
 class StartupSplash(Toplevel):
-    def __init__(self, settings: Settings, pack: Pack, callback: Callable[[], None]) -> None:
+    def __init__(self, pack: Pack, callback: Callable[[], None]) -> None:
         super().__init__(bg="black")
 
         self.callback = callback
@@ -49,13 +52,13 @@ class StartupSplash(Toplevel):
 
         self.geometry(f"{width}x{height}+{x}+{y}")
 
+        label = Label(self, width=width, height=height)
+        label.pack()
+
         if getattr(image, "n_frames", 0) > 1:
-            self.player = VideoPlayer(self, settings, width, height)
-            self.player.play(pack.startup_splash)
+            # Shown only once, so not worth keeping in the frame cache
+            self.animation = AnimatedImage(label, Frames(pack.paths, pack.startup_splash, (width, height)))
         else:
-            label = Label(self, width=width, height=height)
-            label.pack()
-
             resized = image.resize((width, height), Image.LANCZOS).convert("RGBA")
             self.photo_image = ImageTk.PhotoImage(resized)
             label.config(image=self.photo_image)
@@ -63,20 +66,17 @@ class StartupSplash(Toplevel):
         self.fade_in()
 
     def fade_in(self) -> None:
-        if self.opacity < 1:
-            self.opacity += 0.01
-            self.attributes("-alpha", self.opacity)
-            self.after(10, self.fade_in)
-        else:
-            self.after(2000, self.fade_out)
+        TweenEngine.of(self).add(self.set_opacity, 0, 1, FADE_IN_DURATION, ease_in_out, done=lambda: self.after(2000, self.fade_out))
 
     def fade_out(self) -> None:
-        if self.opacity > 0:
-            self.opacity -= 2 * 0.01
-            self.attributes("-alpha", self.opacity)
-            self.after(10 // 4, self.fade_out)
-        else:
-            if hasattr(self, "player"):
-                self.player.close()
-            self.destroy()
-            self.callback()
+        TweenEngine.of(self).add(self.set_opacity, self.opacity, 0, FADE_OUT_DURATION, done=self.close)
+
+    def set_opacity(self, opacity: float) -> None:
+        self.opacity = opacity
+        self.attributes("-alpha", opacity)
+
+    def close(self) -> None:
+        if hasattr(self, "animation"):
+            self.animation.stop()
+        self.destroy()
+        self.callback()
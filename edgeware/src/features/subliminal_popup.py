@@ -15,31 +15,38 @@
 # You should have received a copy of the GNU General Public License
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
-from tkinter import Label, Toplevel
+from tkinter import Label, Tk
 
 import os_utils
 import utils
 from config.settings import Settings
+from features.window_pool import PooledWindow, WindowPool
 from pack import Pack
 
 
-class SubliminalPopup(Toplevel):
-    def __init__(self, settings: Settings, pack: Pack) -> None:
+class SubliminalWindow(PooledWindow):
+    def __init__(self, root: Tk, settings: Settings) -> None:
+        super().__init__(root, settings)
+        self.label = Label(self)
+        self.keep()
+
+
+class SubliminalPopup:
+    def __init__(self, root: Tk, settings: Settings, pack: Pack) -> None:
         self.subliminal = pack.random_subliminal()
         if not self.should_init():
             return
-        super().__init__()
+        self.root = root
+        self.window = WindowPool.of(root, SubliminalWindow).acquire(settings)
 
-        self.attributes("-topmost", True)
-        os_utils.set_borderless(self)
-        self.attributes("-alpha", settings.subliminal_opacity)
+        self.window.attributes("-alpha", settings.subliminal_opacity)
         if os_utils.is_windows():
-            self.wm_attributes("-transparentcolor", settings.theme.transparent_bg)
+            self.window.wm_attributes("-transparentcolor", settings.theme.transparent_bg)
 
         monitor = utils.random_monitor(settings)
 
-        label = Label(
-            self,
+        label = self.window.label
+        label.config(
             text=self.subliminal,
             font=(settings.theme.font, min(monitor.width, monitor.height) // 10),
             wraplength=monitor.width / 1.5,
@@ -51,8 +58,13 @@ class SubliminalPopup(Toplevel):
         x = monitor.x + (monitor.width - label.winfo_reqwidth()) // 2
         y = monitor.y + (monitor.height - label.winfo_reqheight()) // 2
 
-        self.geometry(f"+{x}+{y}")
-        self.after(settings.subliminal_timeout, self.destroy)
+        self.window.geometry(f"+{x}+{y}")
+        self.window.deiconify()
+        self.timer = self.window.after(settings.subliminal_timeout, self.close)
 
     def should_init(self) -> bool:
         return self.subliminal
+
+    def close(self) -> None:
+        self.window.after_cancel(self.timer)
+        WindowPool.of(self.root, SubliminalWindow).release(self.window)
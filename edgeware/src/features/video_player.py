@@ -15,81 +15,53 @@
 # You should have received a copy of the GNU General Public License
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
-import io
-import logging
-import subprocess
-import sys
 from pathlib import Path
-from threading import Thread
 from tkinter import Label, Misc
 
-import mpv
-import os_utils
 from config.settings import Settings
-from os_utils import close_mpv
-from paths import Process
-from PIL import Image
+from features.mpv_pool import MpvPool, PooledPlayer
+from features.mpv_worker import MpvWorker
+from os_utils.capabilities import get_capabilities
 
 
-class VideoPlayer(Label):
-    def __init__(self, master: Misc, settings: Settings, width: int, height: int) -> None:
-        super().__init__(master, width=width, height=height, bg="black")
-        self.pack()
-
-        self.settings = settings
-        self.properties = {
-            "loop": "inf",
-            "hwdec": "auto" if self.settings.video_hardware_acceleration else "no",
-            "input-cursor-passthrough": "yes",  # Required for buttonless closing
-        }
+def player_properties(settings: Settings) -> dict[str, object]:
+    properties = {
+        "loop": "inf",
+        "hwdec": "auto" if settings.video_hardware_acceleration else "no",
+        "input-cursor-passthrough": "yes",  # Required for buttonless closing
+    }
 
-        if os_utils.is_linux():
-            # Required on Wayland for embedding the player
-            temp = mpv.MPV()
-            for context in ["x11", "x11egl", "x11vk"]:
-                try:
-                    temp["gpu-context"] = context  # Check if context is supported
-                    self.properties["gpu-context"] = context
-                    break
-                except TypeError:
-                    logging.warning(f"mpv GPU context {context} is not supported")
+    gpu_context = get_capabilities().gpu_context
+    if gpu_context:
+        properties["gpu-context"] = gpu_context
 
-    def play(self, media: Path, overlay: Image.Image | None = None) -> None:
-        if not self.settings.mpv_subprocess:
-            self.wait_visibility()  # Needs to be visible for mpv to draw on it
+    return properties
 
-            self.mpv = mpv.MPV(wid=self.winfo_id())
-            for key, value in self.properties.items():
-                self.mpv[key] = value
 
-            if overlay:
-                self.mpv.create_image_overlay().update(overlay)
+class VideoPlayer(Label):
+    def __init__(self, master: Misc, settings: Settings, width: int, height: int, pool: MpvPool | MpvWorker) -> None:
+        super().__init__(master, width=width, height=height, bg="black")
+        self.pack()
+        self.lower()  # Below the captions and buttons of reused popup windows
 
-            self.mpv.play(str(media))
-        else:
-            self.process = subprocess.Popen(
-                [
-                    sys.executable,
-                    Process.LINUX_MPV,
-                    str(self.winfo_id()),
-                    str(self.properties),
-                    media,
-                    "1" if overlay else "0",
-                ],
-                stdin=subprocess.PIPE,
-            )
+        self.settings = settings
+        self.pool = pool
+        self.pooled: PooledPlayer | None = None
+        self.properties = player_properties(settings)
 
-            if overlay:
+    def play(self, media: Path) -> None:
+        self.wait_visibility()  # Needs to be visible for mpv to draw on it
 
-                def send_overlay() -> None:
-                    bytes_io = io.BytesIO()
-                    overlay.save(bytes_io, format="PNG")
-                    self.process.communicate(input=bytes_io.getvalue())
+        if isinstance(self.pool, MpvWorker):
+            self.player_id = self.pool.play(self.winfo_id(), self.properties, str(media))
+            return
 
-                Thread(target=send_overlay).start()
+        self.pooled = self.pool.acquire(self.winfo_id(), self.properties)
+        self.pooled.player.play(str(media))
 
     def close(self) -> None:
-        if not self.settings.mpv_subprocess:
-            close_mpv(self.mpv)
-        else:
-            self.process.kill()
+        if isinstance(self.pool, MpvWorker):
+            self.pool.stop(self.player_id)
+        elif self.pooled:
+            self.pool.release(self.pooled)
+            self.pooled = None
@@ -21,28 +21,31 @@ from tkinter import Tk
 from config.settings import Settings
 from features.vibration_mixin import VibrationMixin
 from features.popup import Popup
+from features.mpv_pool import MpvPool
+from features.mpv_worker import MpvWorker
 from features.video_player import VideoPlayer
 from features.sextoy import Sextoy
 from pack import Pack
 from state import State
-from videoprops import get_video_properties
 
 
 class VideoPopup(Popup, VibrationMixin):
-    def __init__(self, root: Tk, settings: Settings, pack: Pack, state: State, sextoy: Sextoy) -> None:
-        self.media = pack.random_video()
+    def __init__(self, root: Tk, settings: Settings, pack: Pack, state: State, sextoy: Sextoy, mpv_pool: MpvPool | MpvWorker) -> None:
+        # Checked before picking, so that rolls at the limit don't probe a video
+        self.media = pack.random_video() if state.video_number < settings.max_video else None
+        self.info = pack.media_info(self.media) if self.media else None
         self.sextoy = sextoy
         if not self.should_init(settings, state):
             return
         super().__init__(root, settings, pack, state)
 
-        properties = get_video_properties(self.media)
-        self.compute_geometry(properties["width"], properties["height"])
+        path = self.pack.paths.local(self.media)
+        self.compute_geometry(self.info.width, self.info.height)
 
-        self.player = VideoPlayer(self, self.settings, self.width, self.height)
+        self.player = VideoPlayer(self.window, self.settings, self.width, self.height, mpv_pool)
         self.player.properties["volume"] = self.settings.video_volume
         self.player.properties["vf"] = self.try_denial_filter(True)
-        self.player.play(self.media)
+        self.player.play(path)
 
         if hasattr(self, 'trigger_vibration'):
             try:
@@ -53,12 +56,14 @@ class VideoPopup(Popup, VibrationMixin):
         self.init_finish()
 
     def should_init(self, settings: Settings, state: State) -> bool:
-        if state.video_number < settings.max_video and self.media:
+        if state.video_number < settings.max_video and self.media and self.info:
             state.video_number += 1
             return True
         return False
 
     def close(self) -> None:
+        if self.closed:
+            return
         if hasattr(self, 'trigger_vibration'):
             try:
                 self.trigger_vibration("video_close", getattr(self.settings, 'sextoys', {}), self.sextoy)
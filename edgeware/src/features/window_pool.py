@@ -0,0 +1,115 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections.abc import Callable
+from tkinter import Event, Tk, Toplevel
+from typing import Generic, TypeVar
+from weakref import WeakKeyDictionary
+
+import os_utils
+from config.settings import Settings
+
+W = TypeVar("W", bound="PooledWindow")
+
+
+class PooledWindow(Toplevel):
+    """
+    Borderless topmost window that is withdrawn instead of destroyed when
+    closed, so that it can be shown again by the next popup. Children created
+    before calling keep() are reused, any others are destroyed on release.
+    """
+
+    def __init__(self, root: Tk, settings: Settings) -> None:
+        super().__init__(root, bg="black")
+        self.settings = settings
+        self.withdraw()
+        self.attributes("-topmost", True)
+        os_utils.set_borderless(self)
+
+        self.kept: set[str] = set()
+        self.bindings: list[str] = []  # Sequences bound by the current user
+
+    def keep(self) -> None:
+        self.kept = set(self.children)
+
+    def bind_temporary(self, sequence: str, func: Callable[[Event], object]) -> None:
+        # Unbound when the window is released
+        self.bind(sequence, func)
+        self.bindings.append(sequence)
+
+    def reset(self) -> None:
+        for name, child in list(self.children.items()):
+            if name in self.kept:
+                child.pack_forget()
+                child.place_forget()
+            else:
+                child.destroy()
+
+        for sequence in self.bindings:
+            self.unbind(sequence)
+        self.bindings.clear()
+
+
+class WindowPool(Generic[W]):
+    """
+    Withdrawn windows of one type waiting to be reused. The pool grows as
+    needed, but at most settings.window_pool_size windows are kept withdrawn,
+    windows released beyond that are destroyed.
+    """
+
+    pools: WeakKeyDictionary[Tk, dict[type, "WindowPool"]] = WeakKeyDictionary()
+
+    def __init__(self, root: Tk, window_type: type[W]) -> None:
+        self.root = root
+        self.window_type = window_type
+        self.idle: list[W] = []
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def of(cls, root: Tk, window_type: type[W]) -> "WindowPool[W]":
+        pools = cls.pools.setdefault(root, {})
+        if window_type not in pools:
+            pools[window_type] = cls(root, window_type)
+        return pools[window_type]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def acquire(self, settings: Settings, *args) -> W:
+        self.trim(settings.window_pool_size)
+
+        while self.idle:
+            window = self.idle.pop()
+            if window.winfo_exists():
+                self.hits += 1
+                return window
+
+        self.misses += 1
+        return self.window_type(self.root, settings, *args)
+
+    def release(self, window: W) -> None:
+        window.withdraw()
+        window.reset()
+        self.idle.append(window)
+        self.trim(window.settings.window_pool_size)
+
+    def trim(self, limit: int) -> None:
+        while len(self.idle) > limit:
+            self.idle.pop(0).destroy()
@@ -0,0 +1,47 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+from pathlib import Path
+
+from benchmark import pack, placement, sampler, write_report
+
+BENCHMARKS = {
+    "pack": pack.run,
+    "placement": placement.run,
+    "sampler": sampler.run,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Edgeware++ performance benchmarks")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark", help=f"benchmarks to run ({', '.join(BENCHMARKS)}), all if none are given")
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds to spend on each measurement")
+    parser.add_argument("--report", type=Path, help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark {name}")
+
+    results = {}
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"== {name} ==")
+        results[name] = BENCHMARKS[name](args.duration)
+
+    if args.report:
+        write_report(args.report, args.duration, results)
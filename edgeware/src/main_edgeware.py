@@ -43,6 +43,8 @@ from features.corruption import corruption_danger_check, handle_corruption
 from features.drive import fill_drive, replace_images
 from features.hibernate import main_hibernate, start_main_hibernate
 from features.image_popup import ImagePopup
+from features.booru_prefetch import BooruPrefetcher
+from features.image_prefetch import ImagePrefetcher
 from features.misc import (
     display_notification,
     handle_discord,
@@ -55,10 +57,14 @@ from features.misc import (
     open_web,
     play_audio,
 )
+from features.mpv_pool import MpvPool
+from features.mpv_worker import MpvWorker
 from features.prompt import Prompt
 from features.startup_splash import StartupSplash
 from features.subliminal_popup import SubliminalPopup
+from features.video_player import player_properties
 from features.video_popup import VideoPopup
+from os_utils.capabilities import get_capabilities, monitor_cache
 from pack import Pack
 from panic import start_panic_listener
 from roll import RollTarget, roll_targets
@@ -98,7 +104,9 @@ if __name__ == "__main__":
     root = Tk()
     root.withdraw()
     settings = Settings()
-    pack = Pack(settings.pack_path)
+    get_capabilities()
+    monitor_cache.watch()
+    pack = Pack(settings.pack_path, settings.parallel_media_scan, progressive=True, watch=True, index_metadata=True)
     state = State()
     pygame.init()
     sextoy = Sextoy(settings)
@@ -115,19 +123,22 @@ if __name__ == "__main__":
 
     corruption_danger_check(settings, pack)
 
-    # GPU_CTXS = ["x11", "x11egl", "x11vk"]
-    # mpv_pool = MpvPool(
-    #     size=50,
-    #     gpu_contexts=GPU_CTXS,
-    #     hwdec="auto" if settings.video_hardware_acceleration else "no"
-    # )
+    # Players in a subprocess are pooled by the worker process itself
+    properties = player_properties(settings)
+    mpv_pool = MpvWorker(properties) if settings.mpv_subprocess else MpvPool(size=8, properties=properties)
+
+    prefetcher = ImagePrefetcher(settings, pack)
+    booru = BooruPrefetcher(settings) if settings.booru_download else None
 
     # TODO: Use a dict?
     targets = [
-        RollTarget(lambda: ImagePopup(root, settings, pack, state, sextoy), lambda: settings.image_chance if not settings.mitosis_mode else 0),
-        RollTarget(lambda: VideoPopup(root, settings, pack, state, sextoy), lambda: settings.video_chance if not settings.mitosis_mode else 0),
-        RollTarget(lambda: SubliminalPopup(settings, pack), lambda: settings.subliminal_chance),
-        RollTarget(lambda: Prompt(settings, pack, state, sextoy), lambda: settings.prompt_chance),
+        RollTarget(
+            lambda: ImagePopup(root, settings, pack, state, sextoy, prefetcher, booru),
+            lambda: settings.image_chance if not settings.mitosis_mode else 0,
+        ),
+        RollTarget(lambda: VideoPopup(root, settings, pack, state, sextoy, mpv_pool), lambda: settings.video_chance if not settings.mitosis_mode else 0),
+        RollTarget(lambda: SubliminalPopup(root, settings, pack), lambda: settings.subliminal_chance),
+        RollTarget(lambda: Prompt(root, settings, pack, state, sextoy), lambda: settings.prompt_chance),
         RollTarget(lambda: play_audio(root, settings, pack), lambda: settings.audio_chance),
         RollTarget(lambda: open_web(pack), lambda: settings.web_chance),
         RollTarget(lambda: display_notification(settings, pack, sextoy), lambda: settings.notification_chance),
@@ -136,6 +147,9 @@ if __name__ == "__main__":
 
     def start_main() -> None:
         Thread(target=lambda: replace_images(root, settings, pack), daemon=True).start()  # Thread for performance reasons
+        prefetcher.start(root)
+        if booru:
+            booru.start()
         make_tray_icon(root, settings, pack, state, lambda: main_hibernate(root, settings, pack, state, targets))
         make_desktop_icons(settings)
         handle_corruption(root, settings, pack, state)
@@ -152,8 +166,10 @@ if __name__ == "__main__":
             main(root, settings, pack, targets)
 
     if settings.startup_splash:
-        StartupSplash(settings, pack, start_main)
+        StartupSplash(pack, start_main)
     else:
         start_main()
 
     root.mainloop()
+
+    mpv_pool.shutdown()
@@ -0,0 +1,182 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass
+from threading import Lock, Thread
+
+import mpv
+from paths import Data
+from screeninfo import Monitor, get_monitors
+
+from os_utils import is_linux
+from os_utils.linux_utils import get_desktop_environment
+
+CAPABILITIES_FILE = Data.CACHE / "capabilities.json"
+
+# The detected capabilities depend on these, they're probed again if any change
+SESSION_VARIABLES = ["XDG_CURRENT_DESKTOP", "DESKTOP_SESSION", "KDE_FULL_SESSION", "XDG_SESSION_TYPE", "WAYLAND_DISPLAY", "DISPLAY"]
+
+# Tried in order, the first one supported by mpv is used
+GPU_CONTEXTS = ["x11", "x11egl", "x11vk"]
+
+# Without display change events, monitors are refreshed at most this often
+MONITOR_REFRESH_INTERVAL = 5  # Seconds
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    desktop: str | None = None  # Desktop environment on Linux
+    gpu_context: str | None = None  # mpv GPU context able to embed the player on Linux
+
+
+def mpv_version() -> str:
+    try:
+        return ".".join(map(str, mpv._mpv_client_api_version()))
+    except Exception:
+        return "unknown"
+
+
+def validity_key() -> dict[str, str]:
+    return {
+        "system": platform.system(),
+        "release": platform.release(),
+        "mpv": mpv_version(),
+        **{variable: os.environ.get(variable, "") for variable in SESSION_VARIABLES},
+    }
+
+
+def probe_gpu_context() -> str | None:
+    # Required on Wayland for embedding the player
+    player = mpv.MPV()
+    try:
+        for context in GPU_CONTEXTS:
+            try:
+                player["gpu-context"] = context  # Check if context is supported
+                return context
+            except TypeError:
+                logging.warning(f"mpv GPU context {context} is not supported")
+    finally:
+        player.terminate()
+
+    return None
+
+
+def probe() -> Capabilities:
+    if not is_linux():
+        return Capabilities()
+    return Capabilities(desktop=get_desktop_environment(), gpu_context=probe_gpu_context())
+
+
+_capabilities: Capabilities | None = None
+_capabilities_lock = Lock()
+
+
+def get_capabilities() -> Capabilities:
+    """
+    Capabilities of the platform, probed once and stored along with what they
+    depend on. Probing creates an mpv player and may list all processes, so
+    later launches in the same session reuse the stored results.
+    """
+
+    # Imported here to avoid circular imports, as the pack imports utils
+    from pack.cache import load_json_cache, save_json_cache
+
+    global _capabilities
+    with _capabilities_lock:
+        if _capabilities:
+            return _capabilities
+
+        key = validity_key()
+        data = load_json_cache(CAPABILITIES_FILE)
+        if data.get("key") == key:
+            try:
+                _capabilities = Capabilities(**data["capabilities"])
+                return _capabilities
+            except (KeyError, TypeError) as e:
+                logging.warning(f"Ignoring unreadable platform capabilities. Reason: {e}")
+
+        start = time.perf_counter()
+        _capabilities = probe()
+        save_json_cache(CAPABILITIES_FILE, {"key": key, "capabilities": asdict(_capabilities)})
+        logging.info(f"Probed platform capabilities in {time.perf_counter() - start:.2f} seconds: {_capabilities}")
+
+        return _capabilities
+
+
+class MonitorCache:
+    """
+    Monitors, listed again only after the displays have changed. On X11 the
+    RandR change events are listened to, elsewhere the monitors are listed
+    again at most every MONITOR_REFRESH_INTERVAL seconds.
+    """
+
+    def __init__(self) -> None:
+        self.monitors: list[Monitor] | None = None
+        self.refreshed = 0.0
+        self.watching = False
+        self.lock = Lock()
+
+    def get(self) -> list[Monitor]:
+        with self.lock:
+            if self.monitors is None or (not self.watching and time.monotonic() - self.refreshed >= MONITOR_REFRESH_INTERVAL):
+                self.monitors = get_monitors()
+                self.refreshed = time.monotonic()
+            return self.monitors
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.monitors = None
+
+    def watch(self) -> None:
+        if self.watching or not is_linux():
+            return
+
+        try:
+            from Xlib import display
+            from Xlib.ext import randr
+
+            connection = display.Display()
+            if not connection.has_extension("RANDR"):
+                raise RuntimeError("RandR extension is missing")
+            mask = randr.RRScreenChangeNotifyMask | randr.RRCrtcChangeNotifyMask | randr.RROutputChangeNotifyMask
+            connection.screen().root.xrandr_select_input(mask)
+        except Exception as e:
+            logging.info(f"Display change events are unavailable, monitors will be refreshed periodically. Reason: {e}")
+            return
+
+        self.watching = True
+        self.invalidate()  # Changes before selecting the events were missed
+        Thread(target=self.listen, args=(connection,), name="monitor-watch", daemon=True).start()
+
+    def listen(self, connection: object) -> None:
+        while True:
+            try:
+                connection.next_event()
+            except Exception as e:
+                logging.warning(f"Stopped listening for display changes. Reason: {e}")
+                break
+            self.invalidate()
+
+        self.watching = False
+        self.invalidate()
+
+
+monitor_cache = MonitorCache()
@@ -27,7 +27,8 @@ import mpv
 from config import load_default_config
 from paths import CustomAssets, Process
 
-from os_utils.linux_utils import get_desktop_environment, get_wallpaper_commands, get_wallpaper_function
+from os_utils.capabilities import get_capabilities
+from os_utils.linux_utils import get_wallpaper_commands, get_wallpaper_function
 
 
 def close_mpv(player: mpv.MPV) -> None:
@@ -35,14 +36,14 @@ def close_mpv(player: mpv.MPV) -> None:
 
 
 def set_borderless(window: Toplevel) -> None:
-    if get_desktop_environment() == "kde":
+    if get_capabilities().desktop == "kde":
         window.overrideredirect(True)
     else:
         window.attributes("-type", "splash")
 
 
 def set_wallpaper(wallpaper: Path) -> None:
-    desktop = get_desktop_environment()
+    desktop = get_capabilities().desktop
     commands = get_wallpaper_commands(wallpaper, desktop)
     function = get_wallpaper_function(wallpaper, desktop)
 
@@ -82,7 +83,7 @@ def make_shortcut(title: str, process: Path, icon: Path, location: Path | None =
     ]
 
     file.write_text("\n".join(content))
-    if get_desktop_environment() == "gnome":
+    if get_capabilities().desktop == "gnome":
         subprocess.run(f'gio set "{str(file.absolute())}" metadata::trusted true', shell=True)
 
 
@@ -0,0 +1,70 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import sys
+from multiprocessing.connection import Connection
+
+from features.mpv_pool import MpvPool, PooledPlayer
+
+# Hosts the mpv players of all popups when mpv runs in a subprocess, started
+# once by features.mpv_worker.MpvWorker and controlled through a pair of pipes
+
+
+def handle(pool: MpvPool, players: dict[int, PooledPlayer], writer: Connection, command: str, player_id: int, *args) -> None:
+    match command:
+        case "play":
+            wid, properties, media = args
+            pooled = pool.acquire(wid, properties)
+            players[player_id] = pooled
+            pooled.player.play(media)
+        case "stop":
+            pooled = players.pop(player_id, None)
+            if pooled:
+                pool.release(pooled)
+            writer.send(("stopped", player_id))
+        case _:
+            logging.warning(f"Unknown mpv worker command {command}.")
+
+
+def main(reader: Connection, writer: Connection) -> None:
+    properties, size = reader.recv()
+    pool = MpvPool(size, properties)
+    players: dict[int, PooledPlayer] = {}
+
+    try:
+        while True:
+            try:
+                message = reader.recv()
+            except EOFError:
+                break  # The main process exited
+            if message[0] == "shutdown":
+                break
+
+            try:
+                handle(pool, players, writer, *message)
+            except Exception as e:
+                logging.warning(f"Failed to run mpv worker command {message[0]}. Reason: {e}")
+    finally:
+        for pooled in players.values():
+            pool.terminate(pooled)
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:mpv worker:%(message)s")
+    main(Connection(int(sys.argv[1]), writable=False), Connection(int(sys.argv[2]), readable=False))
@@ -84,7 +84,7 @@ def get_wallpaper_commands(wallpaper: Path, desktop: str) -> list[str]:
         **dict.fromkeys(["fluxbox", "jwm", "openbox", "afterstep"], [f'fbsetbg "{wallpaper}"']),
     }
 
-    return commands.get(desktop) or (get_wm_wallpaper_commands() if desktop in ["i3", "awesome", "dwm", "xmonad", "bspwm"] else [])
+    return commands.get(desktop) or (get_wm_wallpaper_commands(wallpaper) if desktop in ["i3", "awesome", "dwm", "xmonad", "bspwm"] else [])
 
 
 def get_wm_wallpaper_commands(wallpaper: Path) -> list[str]:
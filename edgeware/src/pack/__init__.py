@@ -16,23 +16,33 @@
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import os
 import random
+import time
+from functools import partial
 from pathlib import Path
+from threading import Event, Lock, Thread
 
 import filetype
 from paths import PATH, Assets, CustomAssets, PackPaths
 
-from pack.data import MoodBase, MoodSet
-from pack.load import list_media, load_active_moods, load_config, load_corruption, load_discord, load_index, load_info
+from pack.catalog import MediaCatalog
+from pack.data import Mood, MoodBase, MoodSet, MoodSetCache
+from pack.load import load_active_moods, load_config, load_corruption, load_discord, load_index, load_info
+from pack.manifest import MediaManifest
+from pack.metadata import MediaInfo, MetadataStore
+from pack.sampler import RecencySampler
+from pack.scaled import ScaledImageCache
+from pack.scan import ScanJob, scan_archive, scan_media
+from pack.watch import watch as watch_media
 
+# While loading progressively, found media is made available at this interval
+FLUSH_INTERVAL = 0.05  # Seconds
 
-class Pack:
-    image_ranks = {}
-    video_ranks = {}
-    audio_ranks = {}
 
-    def __init__(self, root: Path) -> None:
-        logging.info(f"Loading pack at {root.relative_to(PATH)}.")
+class Pack:
+    def __init__(self, root: Path, parallel_scan: bool = True, progressive: bool = False, watch: bool = False, index_metadata: bool = False) -> None:
+        logging.info(f"Loading pack at {root.relative_to(PATH) if root.is_relative_to(PATH) else root}.")
 
         self.paths = PackPaths(root)
 
@@ -47,16 +57,49 @@ class Pack:
         self.active_moods = load_active_moods(self.info.mood_file)
         self.block_corruption_moods()
 
-        # Media
-        self.images = list_media(self.paths.image, filetype.is_image)
-        self.videos = list_media(self.paths.video, filetype.is_video)
-        self.audio = list_media(self.paths.audio, filetype.is_audio)
-        self.hypnos = list_media(self.paths.hypno, filetype.is_image) or [CustomAssets.hypno()]
+        # Lookups
+        self.moods: dict[str, Mood] = {}
+        for mood in self.index.moods:
+            self.moods.setdefault(mood.name, mood)
+        self.lists = {attr: MoodSetCache(partial(self.merge_lists, attr)) for attr in ["captions", "denial", "subliminals", "notifications", "prompts", "web"]}
+
+        # Media, found by a background thread if loading progressively. The
+        # pickers serve whatever has been found so far and ready is set once
+        # the scan is done. If watching, changes to the media directories are
+        # applied while running.
+        self.images = MediaCatalog(self.paths.image)
+        self.videos = MediaCatalog(self.paths.video)
+        self.audio = MediaCatalog(self.paths.audio)
+        self.hypnos = MediaCatalog(self.paths.hypno)
+
+        self.image_sampler = RecencySampler({})
+        self.video_sampler = RecencySampler({})
+        self.audio_sampler = RecencySampler({})
+        self.hypno_sampler = RecencySampler({})
+        self.samplers = {"images": self.image_sampler, "videos": self.video_sampler, "audio": self.audio_sampler, "hypnos": self.hypno_sampler}
+
+        self.jobs = [
+            ScanJob("images", self.images.dir, filetype.image_match),
+            ScanJob("videos", self.videos.dir, filetype.video_match),
+            ScanJob("audio", self.audio.dir, filetype.audio_match),
+            ScanJob("hypnos", self.hypnos.dir, filetype.image_match),
+        ]
+        self.watcher = None
+        self.metadata = MetadataStore(self.paths)
+        self.scaled = ScaledImageCache(self.paths, self.metadata)
+
+        self.lock = Lock()
+        self.ready = Event()
+        self.found = 0  # Media files found so far
+        if progressive:
+            Thread(target=self.load_media, args=(parallel_scan, watch, index_metadata), name="pack-load", daemon=True).start()
+        else:
+            self.load_media(parallel_scan, watch, index_metadata)
 
         # Paths
-        self.icon = self.paths.icon if self.paths.icon.is_file() else CustomAssets.icon()
-        self.wallpaper = self.paths.wallpaper if self.paths.wallpaper.is_file() else Assets.DEFAULT_WALLPAPER
-        self.startup_splash = next((path for path in self.paths.splash if path.is_file()), None) or CustomAssets.startup_splash()
+        self.icon = self.paths.local(self.paths.icon) if self.paths.is_file(self.paths.icon) else CustomAssets.icon()
+        self.wallpaper = self.paths.local(self.paths.wallpaper) if self.paths.is_file(self.paths.wallpaper) else Assets.DEFAULT_WALLPAPER
+        self.startup_splash = next((self.paths.local(path) for path in self.paths.splash if self.paths.is_file(path)), None) or CustomAssets.startup_splash()
 
         logging.info(f"Active moods: {self.active_moods()}")
 
@@ -66,50 +109,130 @@ class Pack:
             # Remove moods that aren't enabled by the user from each corruption level
             level.moods = MoodSet([mood for mood in level.moods if mood in active_moods])
 
-    def filter_media(self, media_list: list[Path]) -> list[Path]:
+    def load_media(self, parallel_scan: bool, watch: bool, index_metadata: bool) -> None:
+        start = time.perf_counter()
+
+        manifest = MediaManifest(self.paths)
+        found = {job.name: [] for job in self.jobs}
+        flushed = time.perf_counter()
+        if self.paths.archive:
+            media = scan_archive(manifest, self.paths.archive, self.jobs)
+        else:
+            media = scan_media(manifest, self.jobs, parallel_scan)
+
+        for job, name in media:
+            found[job.name].append(name)
+            if time.perf_counter() - flushed >= FLUSH_INTERVAL:
+                self.add_media(found)
+                flushed = time.perf_counter()
+        self.add_media(found)
+        manifest.save()
+
+        self.ready.set()
+        logging.info(f"Pack media ready after {time.perf_counter() - start:.2f} seconds.")
+
+        # Archives are read-only, so there are no changes to watch for
+        if watch and not self.paths.archive:
+            self.watcher = watch_media([job.dir for job in self.jobs], self.known_media, self.change_media)
+
+        if index_metadata:
+            with self.lock:
+                media = [catalog[i] for catalog in [self.images, self.videos, self.audio, self.hypnos] for i in catalog.indices()]
+            self.metadata.index(media)
+
+    def add_media(self, found: dict[str, list[str]]) -> None:
+        with self.lock:
+            for attr, names in found.items():
+                catalog = getattr(self, attr)
+                start = catalog.size
+                for name in names:
+                    catalog.append(name, self.index.media_moods.get(name))
+                if attr in self.samplers:
+                    self.samplers[attr].add(self.mood_buckets(catalog, start))
+                self.found += len(names)
+                names.clear()
+
+    def known_media(self, dir: Path) -> set[str]:
+        catalog = getattr(self, next(job.name for job in self.jobs if job.dir == dir))
+        with self.lock:
+            return {catalog.name(i) for i in catalog.indices()}
+
+    def change_media(self, dir: Path, added: list[str], removed: list[str]) -> None:
+        job = next(job for job in self.jobs if job.dir == dir)
+        catalog = getattr(self, job.name)
+        sampler = self.samplers[job.name]
+
+        # Sniffed before locking, so that the pickers aren't blocked meanwhile
+        valid = []
+        for name in added:
+            try:
+                if job.match(os.path.join(dir, name)):
+                    valid.append(name)
+            except OSError:
+                pass
+
+        with self.lock:
+            removed_count = 0
+            for name in removed:
+                i = catalog.find(name)
+                if i is not None:
+                    catalog.remove(i)
+                    sampler.remove(i)
+                    removed_count += 1
+
+            start = catalog.size
+            for name in valid:
+                if catalog.find(name) is None:
+                    catalog.append(name, self.index.media_moods.get(name))
+            added_count = catalog.size - start
+            sampler.add(self.mood_buckets(catalog, start))
+
+        if added_count or removed_count:
+            logging.info(f"Pack media in {dir.name} changed: {added_count} added, {removed_count} removed.")
+
+    def remove_media(self, media: Path) -> None:
+        if any(job.dir == media.parent for job in self.jobs):
+            self.change_media(media.parent, [], [media.name])
+
+    def mood_buckets(self, catalog: MediaCatalog, start: int = 0) -> dict[str | None, list[int]]:
+        buckets = {}
+        for i in range(start, catalog.size):
+            buckets.setdefault(catalog.mood(i), []).append(i)
+        return buckets
+
+    def random_media(self, catalog: MediaCatalog, sampler: RecencySampler, unweighted: bool = False) -> Path | None:
+        # Unless unweighted, give lower preference to media that has been recently selected
         active_moods = self.active_moods()
-        return list(filter(lambda media: self.index.media_moods.get(media.name) in active_moods, media_list))
-
-    def random_media(self, media_list: list[Path], media_ranks: dict[Path, int]) -> Path | None:
-        filtered = self.filter_media(media_list)
-        if not filtered:
-            return None
-
-        # Give lower preference to media that has been recently selected
-        max_rank = len(media_list)
-        ranks = [media_ranks.get(media, max_rank) for media in filtered]
-        weights = [2 ** (16 * rank / max_rank) for rank in ranks]
-        media = random.choices(filtered, weights, k=1)[0]
-
-        for key, value in media_ranks.items():
-            media_ranks[key] = min(value + 1, max_rank)
-        media_ranks[media] = 1
+        with self.lock:
+            i = sampler.choose_uniform(active_moods) if unweighted else sampler.choose(active_moods)
+            return catalog[i] if i is not None else None
 
-        return media
+    def media_info(self, media: Path) -> MediaInfo | None:
+        return self.metadata.get(media)
 
     def random_image(self, unweighted: bool = False) -> Path | None:
-        if unweighted:
-            images = self.filter_media(self.images)
-            return random.choice(images) if images else None
-        return self.random_media(self.images, self.image_ranks)
+        return self.random_media(self.images, self.image_sampler, unweighted)
 
     def random_video(self) -> Path | None:
-        return self.random_media(self.videos, self.video_ranks)
+        return self.random_media(self.videos, self.video_sampler)
 
     def random_audio(self) -> Path | None:
-        return self.random_media(self.audio, self.audio_ranks)
+        return self.random_media(self.audio, self.audio_sampler)
 
     def random_hypno(self) -> Path:
-        return random.choice(self.hypnos)  # Guaranteed to be non-empty
+        return self.random_media(self.hypnos, self.hypno_sampler, True) or CustomAssets.hypno()
 
-    def find_list(self, attr: str) -> list:
-        active_moods = self.active_moods()
+    def merge_lists(self, attr: str, active_moods: MoodSet) -> list:
         moods = list(filter(lambda mood: mood.name in active_moods, self.index.moods))
         lists = [getattr(self.index.default, attr)] + list(map(lambda mood: getattr(mood, attr), moods))
         return [item for list in lists for item in list]
 
+    def find_list(self, attr: str) -> list:
+        # Merged once per set of active moods, the list must not be modified
+        return self.lists[attr].get(self.active_moods())
+
     def find_media_mood(self, media: Path) -> MoodBase:
-        return next((mood for mood in self.index.moods if mood.name == self.index.media_moods.get(media.name)), None) or self.index.default
+        return self.moods.get(self.index.media_moods.get(media.name)) or self.index.default
 
     def find_captions(self, media: Path | None = None) -> list[str]:
         return (self.find_media_mood(media).captions or self.index.default.captions) if media else self.find_list("captions")
@@ -130,7 +253,8 @@ class Pack:
         return random.choice(notifications) if notifications else self.random_caption()
 
     def random_denial(self) -> str:
-        return random.choice(self.find_list("denial") or ["Not for you~"])
+        denial = self.find_list("denial")
+        return random.choice(denial) if denial else "Not for you~"
 
     def random_prompt(self) -> str | None:
         prompts = self.find_list("prompts")
@@ -146,5 +270,9 @@ class Pack:
         return prompt.strip()
 
     def random_web(self) -> str | None:
-        web = random.choice(self.find_list("web") or [None])
-        return web.url + random.choice(web.args) if web else None
+        web = self.find_list("web")
+        if not web:
+            return None
+
+        web = random.choice(web)
+        return web.url + random.choice(web.args)
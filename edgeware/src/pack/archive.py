@@ -0,0 +1,182 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import io
+import logging
+import mmap
+import os
+import shutil
+import struct
+import zipfile
+from hashlib import md5
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
+
+from paths import Data
+
+from pack.cache import shared_file_cache
+
+# Compressed members are extracted to a shared cache, evicting the least
+# recently used files once it grows past this size
+EXTRACT_CACHE_SIZE = 2 * 1024**3  # Bytes
+
+# Offsets of the name and extra field lengths in a local file header
+LOCAL_HEADER = struct.Struct("<26xHH")
+
+# Files and directories only found at the root of a pack
+PACK_FILES = ["aud", "img", "subliminals", "vid", "captions.json", "config.json", "corruption.json", "index.json", "info.json", "media.json"]
+
+
+class MappedFile(io.RawIOBase):
+    """Read-only file object over a slice of a memory mapped file"""
+
+    def __init__(self, view: memoryview) -> None:
+        self.view = view
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:
+        n = max(min(len(buffer), len(self.view) - self.position), 0)
+        buffer[:n] = self.view[self.position : self.position + n]
+        self.position += n
+        return n
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self.position, os.SEEK_END: len(self.view)}[whence]
+        self.position = max(base + offset, 0)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+
+class PackArchive:
+    """
+    A pack inside a zip file. Paths inside the archive are given as if the zip
+    file were the pack directory. Stored members are read straight from the
+    memory mapped archive, compressed members and anything that needs a real
+    file are extracted to the shared extraction cache.
+    """
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        self.zip = zipfile.ZipFile(file)
+        with open(file, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Packs are often zipped with their directory, in which case that
+        # directory is used as the root of the pack
+        self.prefix = ""
+        tops = {info.filename.split("/")[0] for info in self.zip.infolist()}
+        if len(tops) == 1 and not tops & set(PACK_FILES) and any("/" in info.filename for info in self.zip.infolist()):
+            self.prefix = f"{tops.pop()}/"
+
+        self.members: dict[str, zipfile.ZipInfo] = {}  # Path relative to the root -> member
+        self.dirs: dict[str, list[str]] = {"": []}  # Directory relative to the root -> file names
+        for info in self.zip.infolist():
+            if not info.filename.startswith(self.prefix):
+                continue
+
+            relative = PurePosixPath(info.filename[len(self.prefix) :])
+            parents = [str(parent) if str(parent) != "." else "" for parent in relative.parents]
+            for dir in parents:
+                self.dirs.setdefault(dir, [])
+            if info.is_dir():
+                self.dirs.setdefault(str(relative), [])
+            elif str(relative):
+                self.members[str(relative)] = info
+                self.dirs[parents[0]].append(relative.name)
+
+    def relative(self, path: Path) -> str | None:
+        try:
+            relative = path.relative_to(self.file).as_posix()
+        except ValueError:
+            return None
+        return relative if relative != "." else ""
+
+    def contains(self, path: Path) -> bool:
+        return self.relative(path) is not None
+
+    def info(self, path: Path) -> zipfile.ZipInfo | None:
+        return self.members.get(self.relative(path))
+
+    def is_file(self, path: Path) -> bool:
+        return self.info(path) is not None
+
+    def is_dir(self, path: Path) -> bool:
+        return self.relative(path) in self.dirs
+
+    def list_files(self, dir: Path) -> list[str]:
+        return self.dirs.get(self.relative(dir), [])
+
+    def member(self, path: Path) -> zipfile.ZipInfo:
+        info = self.info(path)
+        if not info:
+            raise FileNotFoundError(f"{path.name} not found in {self.file.name}")
+        return info
+
+    def mapped(self, info: zipfile.ZipInfo) -> memoryview | None:
+        # Only unencrypted stored members can be read directly
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return None
+        name_length, extra_length = LOCAL_HEADER.unpack_from(self.mmap, info.header_offset)
+        start = info.header_offset + 30 + name_length + extra_length
+        return memoryview(self.mmap)[start : start + info.file_size]
+
+    def open(self, path: Path) -> BinaryIO:
+        info = self.member(path)
+        view = self.mapped(info)
+        if view is not None:
+            return io.BufferedReader(MappedFile(view))
+        return open(self.local(path), "rb")
+
+    def stream(self, path: Path) -> BinaryIO:
+        # Compressed members are decompressed while reading instead of
+        # extracted, which is slow to seek backwards in but fine for probing
+        info = self.member(path)
+        view = self.mapped(info)
+        if view is not None:
+            return io.BufferedReader(MappedFile(view))
+        return self.zip.open(info)
+
+    def head(self, path: Path, size: int) -> bytes:
+        info = self.member(path)
+        view = self.mapped(info)
+        if view is not None:
+            return bytes(view[:size])
+        with self.zip.open(info) as f:
+            return f.read(size)
+
+    def local(self, path: Path) -> Path:
+        info = self.member(path)
+        key = md5(f"{self.file.resolve()}:{info.filename}:{info.CRC}:{info.file_size}".encode()).hexdigest()
+
+        def extract(f: BinaryIO) -> None:
+            with self.zip.open(info) as source:
+                shutil.copyfileobj(source, f)
+
+        try:
+            return shared_file_cache(Data.EXTRACT_CACHE, EXTRACT_CACHE_SIZE).get(f"{key}{PurePosixPath(info.filename).suffix}", info.file_size, extract)
+        except (OSError, zipfile.BadZipFile) as e:
+            logging.warning(f"Failed to extract {path.name} from {self.file.name}. Reason: {e}")
+            raise
@@ -0,0 +1,254 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from functools import cache
+from hashlib import md5
+from json.decoder import JSONDecodeError
+from pathlib import Path
+from typing import BinaryIO, TypeVar
+from zipfile import ZipInfo
+
+from paths import PackPaths
+
+T = TypeVar("T")
+
+# Bumped whenever the format of a cache file changes, old files are ignored
+CACHE_VERSION = 1
+
+# Modification times can have a resolution as coarse as two seconds, a file or
+# directory modified within this window of being cached may change again
+# without its modification time changing
+RACY_WINDOW = 2 * 10**9  # Nanoseconds
+
+# Files are hashed in chunks of this size, so that large ones aren't read into memory at once
+HASH_CHUNK_SIZE = 1024**2  # Bytes
+
+# Size, modification time (None if racy) and MD5 of a file, or size, None and
+# CRC of an archive member, None if missing
+SourceKey = tuple[int, int | None, str] | None
+
+# Finds the member of a pack archive at a path, None if it doesn't exist
+MemberLookup = Callable[[Path], ZipInfo | None]
+
+
+def cache_file(directory: Path, paths: PackPaths, suffix: str = ".json") -> Path:
+    key = md5(str(paths.root.resolve()).encode()).hexdigest()
+    return directory / f"{key}{suffix}"
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    # Written to a temporary file first so that a crash or another Edgeware++
+    # process never leaves a partially written cache behind
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp, path)
+    except OSError as e:
+        logging.warning(f"Failed to write cache {path.name}. Reason: {e}")
+        Path(temp).unlink(missing_ok=True)
+
+
+def load_json_cache(path: Path) -> dict:
+    try:
+        with open(path) as f:
+            data = json.loads(f.read())
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            return data
+    except FileNotFoundError:
+        pass
+    except (OSError, JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable cache {path.name}. Reason: {e}")
+
+    return {}
+
+
+def save_json_cache(path: Path, data: dict) -> None:
+    write_atomic(path, json.dumps({**data, "version": CACHE_VERSION}).encode())
+
+
+class LogCapture(logging.Handler):
+    """Records what the current thread logs at warning level or above"""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.thread = threading.get_ident()
+        self.records: list[tuple[int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread == self.thread:
+            self.records.append((record.levelno, record.getMessage()))
+
+
+def file_md5(f: BinaryIO) -> str:
+    hash = md5()
+    while chunk := f.read(HASH_CHUNK_SIZE):
+        hash.update(chunk)
+    return hash.hexdigest()
+
+
+def member_key(member: MemberLookup, path: Path) -> SourceKey:
+    # The central directory of an archive already has a checksum of every member
+    info = member(path)
+    return (info.file_size, None, f"{info.CRC:08x}") if info else None
+
+
+def source_key(path: Path, start: int) -> SourceKey:
+    try:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            digest = file_md5(f)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns if stat.st_mtime_ns < start - RACY_WINDOW else None, digest
+
+
+def source_valid(path: Path, key: SourceKey) -> bool:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return key is None
+    if key is None or stat.st_size != key[0]:
+        return False
+    if stat.st_mtime_ns == key[1]:
+        return True
+
+    # Touched or copied files are still valid if their content didn't change
+    try:
+        with open(path, "rb") as f:
+            return file_md5(f) == key[2]
+    except OSError:
+        return False
+
+
+def load_compiled(file: Path, sources: list[Path], compile: Callable[[], T], member: MemberLookup | None = None) -> T:
+    """
+    Returns what compile returns, pickled in file until any of the source files
+    change. Warnings logged by compile are logged again when the cached result
+    is used, so problems with the sources aren't hidden by the cache. If the
+    sources are members of a pack archive, they are looked up with member and
+    compared by their size and CRC instead.
+    """
+
+    def valid(path: Path, key: SourceKey) -> bool:
+        return member_key(member, path) == key if member else source_valid(path, key)
+
+    try:
+        with open(file, "rb") as f:
+            cached = pickle.loads(f.read())
+        if cached["version"] == CACHE_VERSION and all(valid(path, cached["sources"].get(path.name)) for path in sources):
+            for level, message in cached["log"]:
+                logging.log(level, message)
+            logging.info(f"{', '.join(path.name for path in sources if cached['sources'].get(path.name))} loaded from cache.")
+            return cached["value"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Unpickling can fail in many ways if the cached classes changed
+        logging.warning(f"Ignoring unreadable cache {file.name}. Reason: {e}")
+
+    # Keys are taken before compiling, so sources modified meanwhile are compiled again next time
+    start = time.time_ns()
+    keys = {path.name: member_key(member, path) if member else source_key(path, start) for path in sources}
+
+    capture = LogCapture()
+    logging.getLogger().addHandler(capture)
+    try:
+        value = compile()
+    finally:
+        logging.getLogger().removeHandler(capture)
+
+    write_atomic(file, pickle.dumps({"version": CACHE_VERSION, "sources": keys, "log": capture.records, "value": value}, pickle.HIGHEST_PROTOCOL))
+    return value
+
+
+class FileCache:
+    """Files in a directory, bounded in size by evicting the least recently used ones"""
+
+    def __init__(self, dir: Path, limit: int) -> None:
+        self.dir = dir
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.size = None  # Computed on first use
+
+    def files(self) -> list[os.DirEntry]:
+        try:
+            with os.scandir(self.dir) as it:
+                return [entry for entry in it if entry.is_file() and not entry.name.startswith(".")]
+        except FileNotFoundError:
+            return []
+
+    def find(self, key: str) -> Path | None:
+        path = self.dir / key
+        try:
+            # The modification time marks when the file was last used
+            os.utime(path)
+            return path
+        except OSError:
+            return None
+
+    def get(self, key: str, size: int, write: Callable[[BinaryIO], None]) -> Path:
+        path = self.dir / key
+        with self.lock:
+            if self.find(key):
+                return path
+
+            if self.size is None:
+                self.size = sum(entry.stat().st_size for entry in self.files())
+            self.evict(size)
+            self.size += size
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=self.dir, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(temp, path)
+        except BaseException:
+            Path(temp).unlink(missing_ok=True)
+            raise
+        return path
+
+    def evict(self, needed: int) -> None:
+        if self.size + needed <= self.limit:
+            return
+
+        for entry in sorted(self.files(), key=lambda entry: entry.stat().st_mtime_ns):
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self.size -= size
+            except OSError:
+                # Files in use can't be removed on Windows
+                continue
+            if self.size + needed <= self.limit:
+                return
+
+
+@cache
+def shared_file_cache(dir: Path, limit: int) -> FileCache:
+    # Shared by everything using the same directory
+    return FileCache(dir, limit)
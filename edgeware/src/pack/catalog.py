@@ -0,0 +1,97 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from pathlib import Path
+
+
+class MediaCatalog:
+    """
+    Media files of one directory, stored compactly for large packs. Media is
+    identified by its index, the file names are packed in a single buffer and
+    the mood of each file is stored as a small integer. Paths are only created
+    when a file is used.
+
+    Removed media keeps its index so that indices stay valid, it is only
+    skipped when iterating.
+    """
+
+    def __init__(self, dir: Path) -> None:
+        self.dir = dir
+        self.names = bytearray()  # UTF-8 file names, back to back
+        self.offsets = array("I", [0])  # Index -> start of its name, plus the end of the last name
+        self.mood_ids = array("H")  # Index -> mood id
+
+        self.moods: list[str | None] = []  # Mood id -> mood name
+        self.mood_index: dict[str | None, int] = {}  # Mood name -> mood id
+        self.removed: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.mood_ids) - len(self.removed)
+
+    def __iter__(self) -> Iterator[Path]:
+        for i in self.indices():
+            yield self[i]
+
+    @property
+    def size(self) -> int:
+        # Including removed media, the index of the next media appended
+        return len(self.mood_ids)
+
+    def indices(self) -> Iterator[int]:
+        return (i for i in range(len(self.mood_ids)) if i not in self.removed)
+
+    def __getitem__(self, i: int) -> Path:
+        # Absolute names, used for fallback assets, replace the directory
+        return self.dir / self.name(i)
+
+    def name(self, i: int) -> str:
+        if i < 0:
+            i += len(self.mood_ids)
+        if not 0 <= i < len(self.mood_ids):
+            raise IndexError("media index out of range")
+        return self.names[self.offsets[i] : self.offsets[i + 1]].decode("utf-8", "surrogatepass")
+
+    def mood(self, i: int) -> str | None:
+        return self.moods[self.mood_ids[i]]
+
+    def append(self, name: str, mood: str | None) -> None:
+        if mood not in self.mood_index:
+            self.mood_index[mood] = len(self.moods)
+            self.moods.append(mood)
+
+        self.names += name.encode("utf-8", "surrogatepass")
+        self.offsets.append(len(self.names))
+        self.mood_ids.append(self.mood_index[mood])
+
+    def find(self, name: str) -> int | None:
+        # Searching the packed names avoids keeping a dict of every name
+        encoded = name.encode("utf-8", "surrogatepass")
+        start = self.names.find(encoded)
+        while start != -1:
+            i = bisect_left(self.offsets, start)
+            end = start + len(encoded)
+            if i < len(self.mood_ids) and self.offsets[i] == start and self.offsets[i + 1] == end and i not in self.removed:
+                return i
+            start = self.names.find(encoded, start + 1)
+        return None
+
+    def remove(self, i: int) -> None:
+        self.removed.add(i)
@@ -15,22 +15,74 @@
 # You should have received a copy of the GNU General Public License
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
 
 
 # "mood in set" additionally return True if "mood" is the default one
 class MoodSet(set):
+    # Incremented whenever the set is modified, so anything computed from the
+    # set can be cached by its identity and version
+    version = 0
+
     def __contains__(self, o: object) -> bool:
         return o is None or super().__contains__(o)
 
 
+def track_changes(name: str) -> None:
+    method = getattr(set, name)
+
+    def modify(self: MoodSet, *args) -> object:
+        self.version += 1
+        return method(self, *args)
+
+    setattr(MoodSet, name, modify)
+
+
+for name in ["add", "clear", "discard", "pop", "remove", "update", "difference_update", "intersection_update", "symmetric_difference_update"]:
+    track_changes(name)
+for name in ["__iand__", "__ior__", "__isub__", "__ixor__"]:
+    track_changes(name)
+
+
 # "mood in set" always returns True, used when a mood file can't be used
-class UniversalSet(set):
+class UniversalSet(MoodSet):
     def __contains__(self, o: object) -> bool:
         return True
 
 
+class MoodSetCache(Generic[T]):
+    """
+    Caches values computed from mood sets by their identity and version. Under
+    corruption the active moods alternate between the sets of a few levels, so
+    the value for each set only needs to be computed once.
+    """
+
+    def __init__(self, compute: Callable[[MoodSet], T]) -> None:
+        self.compute = compute
+        self.cache: dict[int, tuple[MoodSet, int, T]] = {}  # id(moods) -> (moods, version, value)
+
+    def get(self, moods: MoodSet) -> T:
+        # The sets are kept referenced so that their ids can't be reused
+        cached = self.cache.get(id(moods))
+        if cached and cached[0] is moods and cached[1] == moods.version:
+            return cached[2]
+
+        if len(self.cache) >= 64:
+            self.cache.clear()
+
+        value = self.compute(moods)
+        self.cache[id(moods)] = (moods, moods.version, value)
+        return value
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
 @dataclass
 class CorruptionLevel:
     moods: MoodSet[str]
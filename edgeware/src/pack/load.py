@@ -17,26 +17,25 @@
 
 import json
 import logging
-import os
 from collections.abc import Callable
-from dataclasses import asdict
 from json.decoder import JSONDecodeError
 from pathlib import Path
-from typing import TypeVar
+from typing import IO, TypeVar
 
 import utils
 from paths import Data, PackPaths
 from voluptuous import ALLOW_EXTRA, PREVENT_EXTRA, All, Any, Equal, In, Length, Number, Optional, Range, Required, Schema, Url
 from voluptuous.error import Invalid
 
+from pack.cache import cache_file, load_compiled
 from pack.data import CorruptionLevel, Default, Discord, Index, Info, Mood, MoodBase, MoodSet, UniversalSet, Web
 
 T = TypeVar("T")
 
 
-def try_load(path: Path, load: Callable[[str], T]) -> T | None:
+def try_load(path: Path, load: Callable[[str], T], opener: Callable[[Path], IO] = open) -> T | None:
     try:
-        with open(path) as f:
+        with opener(path) as f:
             data = load(f.read())
             logging.info(f"{path.name} loaded successfully.")
             return data
@@ -91,7 +90,7 @@ def load_corruption(paths: PackPaths) -> list[CorruptionLevel]:
 
         return levels
 
-    return try_load(paths.corruption, load) or []
+    return try_load(paths.corruption, load, paths.open) or []
 
 
 def load_discord(paths: PackPaths) -> Discord:
@@ -108,10 +107,17 @@ def load_discord(paths: PackPaths) -> Discord:
 
         return Discord(discord[0], discord[1] if has_image else default.image)
 
-    return try_load(paths.discord, load) or default
+    return try_load(paths.discord, load, paths.open) or default
 
 
 def load_index(paths: PackPaths) -> Index:
+    # Validating the index is slow for large packs, so the result is cached until the files change
+    sources = [paths.index, paths.captions, paths.media, paths.prompt, paths.web]
+    member = paths.archive.info if paths.archive else None
+    return load_compiled(cache_file(Data.INDEX_CACHE, paths, ".pickle"), sources, lambda: load_index_files(paths), member)
+
+
+def load_index_files(paths: PackPaths) -> Index:
     def load(content: str) -> Index:
         index = json.loads(content)
 
@@ -159,44 +165,36 @@ def load_index(paths: PackPaths) -> Index:
         for mood in moods:
             validate_web_args(mood)
 
-        def load_base(base: dict) -> MoodBase:
+        def load_base(base: dict) -> dict:
             web = []
             for i in range(len(base.get("web", []))):
                 args = base.get("webArgs", [])
                 web.append(Web(base["web"][i], args[i] if len(args) > i else [""]))
 
-            return asdict(
-                MoodBase(
-                    base.get("maxClicks", 1),
-                    base.get("captions", []),
-                    base.get("denial", []),
-                    base.get("subliminals", []),
-                    base.get("notifications", []),
-                    base.get("prompts", []),
-                    web,
-                )
-            )
-
-        def fix_web(base: MoodBase) -> MoodBase:
-            base.web = [Web(web["url"], web["args"]) for web in base.web]
-            return base
+            return {
+                "max_clicks": base.get("maxClicks", 1),
+                "captions": base.get("captions", []),
+                "denial": base.get("denial", []),
+                "subliminals": base.get("subliminals", []),
+                "notifications": base.get("notifications", []),
+                "prompts": base.get("prompts", []),
+                "web": web,
+            }
 
         return Index(
-            fix_web(
-                Default(
-                    **load_base(default),
-                    popup_close=default.get("popupClose", "I Submit <3"),
-                    prompt_command=default.get("promptCommand", "Type for me, slut~"),
-                    prompt_submit=default.get("promptSubmit", "I Submit <3"),
-                    prompt_min_length=default.get("promptMinLength", 1),
-                    prompt_max_length=default.get("promptMaxLength", 1),
-                )
+            Default(
+                **load_base(default),
+                popup_close=default.get("popupClose", "I Submit <3"),
+                prompt_command=default.get("promptCommand", "Type for me, slut~"),
+                prompt_submit=default.get("promptSubmit", "I Submit <3"),
+                prompt_min_length=default.get("promptMinLength", 1),
+                prompt_max_length=default.get("promptMaxLength", 1),
             ),
-            [fix_web(Mood(**load_base(mood), name=mood["mood"])) for mood in moods],
+            [Mood(**load_base(mood), name=mood["mood"]) for mood in moods],
             {file: mood["mood"] for mood in moods for file in mood.get("media", [])},
         )
 
-    return try_load(paths.index, load) or load_index_fallback(paths)
+    return try_load(paths.index, load, paths.open) or load_index_fallback(paths)
 
 
 def load_info(paths: PackPaths) -> Info:
@@ -210,7 +208,7 @@ def load_info(paths: PackPaths) -> Info:
 
         return Info(info["name"], Data.MOODS / f"{info['id']}.{mood_id}.json", info["creator"], info["version"], info["description"])
 
-    return try_load(paths.info, load) or default
+    return try_load(paths.info, load, paths.open) or default
 
 
 def load_config(paths: PackPaths) -> dict:
@@ -219,7 +217,7 @@ def load_config(paths: PackPaths) -> dict:
         filter = ["version", "versionplusplus", "packPath"]
         return {key: value for key, value in config.items() if key not in filter}
 
-    return try_load(paths.config, load) or {}
+    return try_load(paths.config, load, paths.open) or {}
 
 
 def load_active_moods(mood_file: Path) -> Callable[[], set[str]]:
@@ -229,11 +227,8 @@ def load_active_moods(mood_file: Path) -> Callable[[], set[str]]:
         mood_set = MoodSet(moods["active"])
         return lambda: mood_set
 
-    return try_load(mood_file, load) or (lambda: UniversalSet())
-
-
-def list_media(dir: Path, is_valid: Callable[[str], bool]) -> list[Path]:
-    return [(dir / file) for file in os.listdir(dir) if is_valid(dir / file)] if dir.is_dir() else []
+    universal_set = UniversalSet()
+    return try_load(mood_file, load) or (lambda: universal_set)
 
 
 def load_index_fallback(paths: PackPaths) -> Index:
@@ -245,12 +240,13 @@ def load_index_fallback(paths: PackPaths) -> Index:
     prompts = load_prompts(paths)
     web = load_web(paths)
 
+    moods: dict[str, Mood] = {}
+
     def get_or_add_mood(name: str) -> Mood:
-        mood = next((mood for mood in index.moods if mood.name == name), None)
-        if not mood:
-            mood = Mood(name=name)
-            index.moods.append(mood)
-        return mood
+        if name not in moods:
+            moods[name] = Mood(name=name)
+            index.moods.append(moods[name])
+        return moods[name]
 
     # Media
     for mood_name in set(index.media_moods.values()):
@@ -304,7 +300,7 @@ def load_media(paths: PackPaths) -> dict[str, str]:
         Schema({str: All([str], Length(min=1))})(media)
         return {file: mood for mood, files in media.items() for file in files if mood != "default"}
 
-    return try_load(paths.media, load) or {}
+    return try_load(paths.media, load, paths.open) or {}
 
 
 def load_captions(paths: PackPaths) -> dict:
@@ -337,7 +333,7 @@ def load_captions(paths: PackPaths) -> dict:
 
         return captions
 
-    return try_load(paths.captions, load) or {}
+    return try_load(paths.captions, load, paths.open) or {}
 
 
 def load_prompts(paths: PackPaths) -> dict:
@@ -364,7 +360,7 @@ def load_prompts(paths: PackPaths) -> dict:
 
         return prompts
 
-    return try_load(paths.prompt, load) or {}
+    return try_load(paths.prompt, load, paths.open) or {}
 
 
 def load_web(paths: PackPaths) -> dict:
@@ -379,4 +375,4 @@ def load_web(paths: PackPaths) -> dict:
 
         return web
 
-    return try_load(paths.web, load) or {}
+    return try_load(paths.web, load, paths.open) or {}
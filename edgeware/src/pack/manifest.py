@@ -0,0 +1,58 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+from pathlib import Path
+
+from paths import Data, PackPaths
+
+from pack.cache import RACY_WINDOW, cache_file, load_json_cache, save_json_cache
+
+# (size, modification time, MIME type or None if the file isn't valid media)
+FileEntry = tuple[int, int, str | None]
+
+
+class MediaManifest:
+    """
+    Remembers the sniffed type of every file in the media directories of a
+    pack, keyed by the path, size and modification time of the file.
+    """
+
+    def __init__(self, paths: PackPaths) -> None:
+        self.file = cache_file(Data.MEDIA_CACHE, paths)
+        self.dirs = load_json_cache(self.file).get("dirs", {})
+        self.changed = False
+
+    def cached(self, dir: Path, dir_mtime: int) -> list[str] | None:
+        # Files can't be added, removed or renamed without changing the
+        # modification time of the directory, so no file needs to be checked
+        cached = self.dirs.get(dir.name, {})
+        if cached.get("mtime") != dir_mtime:
+            return None
+        return [name for name, (size, mtime, mime) in cached["files"].items() if mime]
+
+    def entries(self, dir: Path) -> dict[str, FileEntry]:
+        return self.dirs.get(dir.name, {}).get("files", {})
+
+    def update(self, dir: Path, dir_mtime: int, scan_start: int, entries: dict[str, FileEntry]) -> None:
+        # A directory modified shortly before the scan isn't trusted on the next launch
+        self.dirs[dir.name] = {"mtime": dir_mtime if dir_mtime < scan_start - RACY_WINDOW else None, "files": entries}
+        self.changed = True
+
+    def save(self) -> None:
+        if self.changed:
+            save_json_cache(self.file, {"dirs": self.dirs})
+            self.changed = False
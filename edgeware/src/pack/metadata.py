@@ -0,0 +1,199 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import os
+import time
+import zipfile
+from collections.abc import Callable
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from subprocess import SubprocessError
+from threading import Lock
+from typing import BinaryIO
+
+from paths import Data, PackPaths
+from PIL import Image
+from videoprops import get_audio_properties, get_video_properties
+
+from pack.cache import RACY_WINDOW, cache_file, load_json_cache, save_json_cache
+
+# While indexing, found metadata is saved at this interval so that it isn't
+# lost if Edgeware++ is closed before indexing is done
+SAVE_INTERVAL = 10  # Seconds
+
+# Size and modification time of a file, or size and CRC of an archive member
+Stamp = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    width: int = 0
+    height: int = 0
+    animated: bool = False
+    frames: int = 1
+    duration: float = 0.0  # Seconds, 0 for static images
+
+
+def number(properties: dict, key: str, type: type[int] | type[float]) -> int | float:
+    # ffprobe reports unknown values as "N/A"
+    try:
+        return type(properties.get(key, 0))
+    except ValueError:
+        return type(0)
+
+
+def probe_image(file: BinaryIO) -> MediaInfo:
+    with Image.open(file) as image:
+        frames = getattr(image, "n_frames", 1)
+        duration = 0.0
+        if frames > 1:
+            # Seeks through the whole file, which is why this is cached
+            for frame in range(frames):
+                image.seek(frame)
+                duration += image.info.get("duration", 0) / 1000
+        return MediaInfo(image.width, image.height, frames > 1, frames, duration)
+
+
+def probe_video(file: Path) -> MediaInfo:
+    properties = get_video_properties(file)
+    return MediaInfo(int(properties["width"]), int(properties["height"]), True, number(properties, "nb_frames", int), number(properties, "duration", float))
+
+
+def probe_audio(file: Path) -> MediaInfo:
+    return MediaInfo(duration=number(get_audio_properties(file), "duration", float))
+
+
+class MetadataStore:
+    """
+    Dimensions, frame counts and durations of the media in a pack, so that
+    popups don't need to decode images or run ffprobe before opening. Entries
+    are keyed by the size and modification time of the file and persisted
+    between launches. Media that hasn't been indexed yet is probed on demand.
+    """
+
+    def __init__(self, paths: PackPaths) -> None:
+        self.paths = paths
+        self.file = cache_file(Data.METADATA_CACHE, paths)
+        self.dirs: dict[str, dict[str, list]] = load_json_cache(self.file).get("dirs", {})
+        self.racy: set[Path] = set()  # Media modified shortly before being probed, not saved
+        self.lock = Lock()
+        self.changed = False
+
+        # ffprobe reads from a real file, images can be read from archives directly
+        self.probes: dict[Path, Callable] = {
+            paths.image: probe_image,
+            paths.hypno: probe_image,
+            paths.video: probe_video,
+            paths.audio: probe_audio,
+        }
+
+    def stamp(self, path: Path) -> Stamp:
+        if self.paths.archive and self.paths.archive.contains(path):
+            info = self.paths.archive.member(path)
+            return info.file_size, info.CRC
+
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: Path) -> MediaInfo | None:
+        # None if the media can't be read
+        try:
+            stamp = self.stamp(path)
+        except OSError as e:
+            logging.warning(f"Failed to read {path.name}. Reason: {e}")
+            return None
+
+        with self.lock:
+            entry = self.dirs.get(path.parent.name, {}).get(path.name)
+        if entry and tuple(entry[:2]) == stamp:
+            return MediaInfo(*entry[2:])
+
+        return self.probe(path, stamp)
+
+    def probe(self, path: Path, stamp: Stamp) -> MediaInfo | None:
+        probe = self.probes.get(path.parent, probe_image)
+        try:
+            if probe is probe_image:
+                with self.paths.stream(path) as f:
+                    info = probe(f)
+            else:
+                info = probe(self.paths.local(path))
+        except (OSError, RuntimeError, SubprocessError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            logging.warning(f"Failed to read metadata of {path.name}. Reason: {e}")
+            return None
+
+        with self.lock:
+            self.dirs.setdefault(path.parent.name, {})[path.name] = [*stamp, *astuple(info)]
+            if not self.paths.archive and stamp[1] > time.time_ns() - RACY_WINDOW:
+                self.racy.add(path)
+            else:
+                self.racy.discard(path)
+            self.changed = True
+        return info
+
+    def index(self, media: list[Path]) -> None:
+        start = time.perf_counter()
+        saved = start
+
+        # Probing videos and audio in an archive would extract all of them,
+        # those are probed on demand instead
+        probed = 0
+        for path in media:
+            if self.paths.archive and self.probes.get(path.parent) is not probe_image:
+                continue
+
+            try:
+                stamp = self.stamp(path)
+            except OSError:
+                continue
+            with self.lock:
+                entry = self.dirs.get(path.parent.name, {}).get(path.name)
+            if entry and tuple(entry[:2]) == stamp:
+                continue
+
+            self.probe(path, stamp)
+            probed += 1
+            if time.perf_counter() - saved >= SAVE_INTERVAL:
+                self.save()
+                saved = time.perf_counter()
+
+        self.prune(media)
+        self.save()
+        logging.info(f"Indexed metadata of {probed} media files in {time.perf_counter() - start:.2f} seconds.")
+
+    def prune(self, media: list[Path]) -> None:
+        # Forgets media that is no longer in the pack
+        names: dict[str, set[str]] = {}
+        for path in media:
+            names.setdefault(path.parent.name, set()).add(path.name)
+
+        with self.lock:
+            for dir, entries in self.dirs.items():
+                for name in entries.keys() - names.get(dir, set()):
+                    del entries[name]
+                    self.changed = True
+
+    def save(self) -> None:
+        with self.lock:
+            if not self.changed:
+                return
+            dirs = {
+                dir: {name: entry for name, entry in entries.items() if self.paths.root / dir / name not in self.racy} for dir, entries in self.dirs.items()
+            }
+            self.changed = False
+        save_json_cache(self.file, {"dirs": dirs})
@@ -0,0 +1,295 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+from array import array
+from collections import deque
+from collections.abc import Hashable
+
+from pack.data import MoodSet, MoodSetCache
+
+# Weight of an item that hasn't been selected during the last n selections
+RESTED_WEIGHT = 2.0**16
+
+
+class FenwickTree:
+    """Prefix sums of a list of weights with O(log n) updates and searches"""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.tree = array("d", bytes(8 * (size + 1)))
+        self.values = array("d", bytes(8 * size))
+        self.sum = 0.0
+
+    def set(self, i: int, value: float) -> None:
+        delta = value - self.values[i]
+        self.values[i] = value
+        self.sum += delta
+        i += 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self) -> float:
+        return self.sum
+
+    def search(self, x: float) -> int:
+        # Smallest index whose prefix sum exceeds x
+        i = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            j = i + step
+            if j <= self.size and self.tree[j] <= x:
+                i = j
+                x -= self.tree[j]
+            step >>= 1
+        return min(i, self.size - 1)
+
+    def append(self, value: float) -> None:
+        self.values.append(value)
+        self.sum += value
+        self.size += 1
+
+        # The new node holds the sum of the range (i - lowbit(i), i]
+        i = self.size
+        total = value
+        j = i - 1
+        while j > i - (i & -i):
+            total += self.tree[j]
+            j -= j & -j
+        self.tree.append(total)
+
+    def pop(self) -> None:
+        # No other node includes the last one in its range
+        self.set(self.size - 1, 0.0)
+        self.values.pop()
+        self.tree.pop()
+        self.size -= 1
+
+    def rebuild(self) -> None:
+        # Clears floating point error accumulated by repeated updates
+        self.tree = array("d", [0.0]) + self.values
+        self.sum = sum(self.values)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+
+class Bucket:
+    """Items of one mood, addressed by their position in the bucket"""
+
+    def __init__(self, members: list[int]) -> None:
+        self.members = array("I", members)
+        self.recent = FenwickTree(len(members))
+
+        # Items that haven't been selected recently all have the same weight,
+        # so their positions are kept in a list and chosen from uniformly
+        self.rested = array("I", range(len(members)))
+        self.rested_slots = array("I", range(len(members)))  # Position -> index in rested, while rested
+
+    def add(self, item: int) -> None:
+        self.rested_slots.append(len(self.rested))
+        self.rested.append(len(self.members))
+        self.members.append(item)
+        self.recent.append(0.0)
+
+    def remove(self, position: int) -> int | None:
+        # The last member is moved into the removed position, and returned
+        if self.recent.values[position] == 0.0:
+            self.wake(position)
+
+        last = len(self.members) - 1
+        moved = None
+        if position != last:
+            moved = self.members[last]
+            self.members[position] = moved
+            self.recent.set(position, self.recent.values[last])
+            if self.recent.values[position] == 0.0:
+                slot = self.rested_slots[last]
+                self.rested[slot] = position
+                self.rested_slots[position] = slot
+
+        self.members.pop()
+        self.recent.pop()
+        self.rested_slots.pop()
+        return moved
+
+    def rest(self, position: int) -> None:
+        self.recent.set(position, 0.0)
+        self.rested_slots[position] = len(self.rested)
+        self.rested.append(position)
+
+    def wake(self, position: int) -> None:
+        i = self.rested_slots[position]
+        last = self.rested.pop()
+        if last != position:
+            self.rested[i] = last
+            self.rested_slots[last] = i
+
+    def rested_weight(self) -> float:
+        return len(self.rested) * RESTED_WEIGHT
+
+
+class RecencySampler:
+    """
+    Chooses items randomly, giving lower preference to recently chosen ones.
+
+    Every item has a rank, the number of choices made since it was last
+    chosen capped at the total number of items n, and is weighted by
+    2 ** (16 * rank / n). Instead of incrementing every rank after each choice,
+    the weights of recently chosen items are stored relative to a shared age
+    offset in a Fenwick tree per bucket, so both choosing and updating take
+    O(log n) time. Items whose rank reaches n are moved to the rested list.
+
+    Items are integers from 0 to n - 1 and are bucketed by their mood, only
+    items in the buckets of the given active moods can be chosen. All state
+    per item is kept in arrays to keep large packs light. Removed items keep
+    their number and new items are numbered after all previous ones.
+
+    The weights are relative to the item count at the last rebase, which
+    only happens when the count has changed noticeably since, so that adding
+    or removing a few items is cheap.
+    """
+
+    def __init__(self, buckets: dict[Hashable, list[int]]) -> None:
+        self.buckets: dict[Hashable, Bucket] = {}
+        self.bucket_list: list[Bucket] = []
+        self.size = 0  # Number of items
+        self.weight_size = 0  # Number of items the weights are relative to
+        self.bucket_of = array("H")  # Item -> index in bucket_list
+        self.position = array("I")  # Item -> position in its bucket
+
+        self.tick = 0  # Number of choices made
+        self.anchor = 0  # Tick that the stored weights are relative to
+        self.last = array("q")  # Item -> tick it was last chosen on, or -1
+        self.history: deque[int] = deque()  # Items chosen on the last len(history) ticks
+        self.eligible = MoodSetCache(lambda moods: [bucket for key, bucket in self.buckets.items() if key in moods and bucket.members])
+
+        self.add(buckets)
+
+    def relative_weight(self, last: int) -> float:
+        return 2 ** (16 * (self.anchor - last) / self.weight_size)
+
+    def expire(self) -> None:
+        while self.history and len(self.history) >= self.weight_size:
+            tick = self.tick - len(self.history)
+            item = self.history.popleft()
+            if self.last[item] == tick:
+                self.bucket_list[self.bucket_of[item]].rest(self.position[item])
+
+    def rebase(self) -> None:
+        self.anchor = self.tick
+        self.weight_size = self.size
+        self.expire()
+        for tick, item in enumerate(self.history, self.tick - len(self.history)):
+            if self.last[item] == tick:
+                self.bucket_list[self.bucket_of[item]].recent.values[self.position[item]] = self.relative_weight(tick)
+        for bucket in self.bucket_list:
+            bucket.recent.rebuild()
+
+    def add(self, buckets: dict[Hashable, list[int]]) -> None:
+        # New items must continue the numbering of the existing ones
+        count = sum(len(members) for members in buckets.values())
+        self.bucket_of.frombytes(bytes(self.bucket_of.itemsize * count))
+        self.position.frombytes(bytes(self.position.itemsize * count))
+        self.last.extend(array("q", [-1]) * count)
+        self.size += count
+
+        for key, members in buckets.items():
+            if key not in self.buckets:
+                self.buckets[key] = Bucket([])
+                self.bucket_list.append(self.buckets[key])
+            bucket = self.buckets[key]
+            index = self.bucket_list.index(bucket)
+            for item in members:
+                self.bucket_of[item] = index
+                self.position[item] = len(bucket.members)
+                bucket.add(item)
+
+        self.eligible.clear()
+        self.resize()
+
+    def remove(self, item: int) -> None:
+        bucket = self.bucket_list[self.bucket_of[item]]
+        moved = bucket.remove(self.position[item])
+        if moved is not None:
+            self.position[moved] = self.position[item]
+
+        self.last[item] = -1  # Ignored in the history from now on
+        self.size -= 1
+        self.eligible.clear()
+        self.resize()
+
+    def resize(self) -> None:
+        # The stored weights depend on the number of items
+        if abs(self.size - self.weight_size) * 16 > self.weight_size:
+            self.rebase()
+
+    def choose_uniform(self, moods: MoodSet) -> int | None:
+        buckets = self.eligible.get(moods)
+        total = sum(len(bucket.members) for bucket in buckets)
+        if total == 0:
+            return None
+
+        i = random.randrange(total)
+        for bucket in buckets:
+            if i < len(bucket.members):
+                return bucket.members[i]
+            i -= len(bucket.members)
+
+    def choose(self, moods: MoodSet) -> int | None:
+        self.expire()
+        if self.tick - self.anchor >= self.weight_size:
+            self.rebase()
+
+        # Multiplying the stored weights by this gives the actual weights
+        scale = 2 ** (16 * (self.tick - self.anchor) / self.weight_size) if self.weight_size else 0
+
+        buckets = []
+        total = 0.0
+        for bucket in self.eligible.get(moods):
+            rested = bucket.rested_weight()
+            recent = scale * bucket.recent.total()
+            buckets.append((bucket, rested, recent))
+            total += rested + recent
+
+        if total <= 0:
+            return None
+
+        x = random.random() * total
+        for bucket, rested, recent in buckets:
+            if x < rested + recent:
+                break
+            x -= rested + recent
+
+        if x < rested:
+            position = bucket.rested[min(int(x / RESTED_WEIGHT), len(bucket.rested) - 1)]
+            bucket.wake(position)
+        else:
+            # Kept strictly below the total in case of floating point error
+            position = bucket.recent.search(min(x - rested, recent * (1 - 1e-9)) / scale)
+            if bucket.recent.values[position] == 0.0:
+                bucket.wake(position)
+        item = bucket.members[position]
+
+        self.last[item] = self.tick
+        self.history.append(item)
+        bucket.recent.set(position, self.relative_weight(self.tick))
+        self.tick += 1
+
+        return item
@@ -0,0 +1,131 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
+from pathlib import Path
+from threading import Lock
+
+from paths import Data, PackPaths
+from PIL import Image
+
+from pack.cache import shared_file_cache
+from pack.metadata import MetadataStore
+
+# Downscaled variants are kept in a shared cache, evicting the least recently
+# used ones once it grows past this size
+SCALED_CACHE_SIZE = 1024**3  # Bytes
+
+# Variants smaller than this aren't worth caching
+MIN_VARIANT_SIZE = 256  # Pixels
+
+
+class ScaledImageCache:
+    """
+    Downscaled variants of the images in a pack, at power of two steps. Popups
+    are resized from the smallest variant that is still larger than the popup
+    instead of from the original. Variants are built in the background the
+    first time an image is shown, and are keyed by the size and modification
+    time of the original so that they are rebuilt when it changes.
+    """
+
+    def __init__(self, paths: PackPaths, metadata: MetadataStore) -> None:
+        self.paths = paths
+        self.metadata = metadata
+        self.files = shared_file_cache(Data.SCALED_CACHE, SCALED_CACHE_SIZE)
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="pack-scale")
+        self.pending: set[str] = set()  # Keys of images whose variants are being built
+        self.lock = Lock()
+
+    def key(self, path: Path) -> str:
+        stamp = self.metadata.stamp(path)
+        return md5(f"{self.paths.root.resolve()}:{path.parent.name}/{path.name}:{stamp[0]}:{stamp[1]}".encode()).hexdigest()
+
+    def find(self, key: str, step: int) -> Path | None:
+        # Variants without transparency are saved as JPEG
+        return self.files.find(f"{key}-{step}.jpg") or self.files.find(f"{key}-{step}.png")
+
+    def open(self, path: Path, source: tuple[int, int], target: tuple[int, int], limit: int) -> Image.Image:
+        """
+        Opens the image at path with the given source size, to be resized to
+        the target size. Only variants up to twice the limit, the size of the
+        largest monitor, are built as larger ones would never be used.
+        """
+
+        step = 0
+        while source[0] >> (step + 1) >= target[0] and source[1] >> (step + 1) >= target[1]:
+            step += 1
+
+        key = None
+        try:
+            key = self.key(path)
+            for n in range(step, 0, -1):
+                variant = self.find(key, n)
+                if variant:
+                    return Image.open(variant)
+        except OSError as e:
+            logging.warning(f"Failed to open scaled variant of {path.name}. Reason: {e}")
+
+        # Loaded before the file is closed, PIL doesn't close files it was given
+        with self.paths.open(path, "rb") as f:
+            image = Image.open(f)
+            image.load()
+
+        if key and step > 0:
+            with self.lock:
+                if key in self.pending:
+                    return image
+                self.pending.add(key)
+            try:
+                self.executor.submit(self.build, key, path, image, limit)
+            except RuntimeError:
+                # Closed
+                with self.lock:
+                    self.pending.discard(key)
+        return image
+
+    def close(self) -> None:
+        """Waits for the variants being built, no more are built afterwards"""
+        self.executor.shutdown(wait=True)
+
+    def build(self, key: str, path: Path, image: Image.Image, limit: int) -> None:
+        try:
+            if image.mode not in ["RGB", "RGBA"]:
+                image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+            step = 0
+            while max(image.size) >= 2 * MIN_VARIANT_SIZE:
+                image = image.reduce(2)
+                step += 1
+                if max(image.size) >= 2 * limit:
+                    continue
+
+                data = io.BytesIO()
+                if image.mode == "RGB":
+                    image.save(data, "JPEG", quality=90)
+                    suffix = ".jpg"
+                else:
+                    image.save(data, "PNG", compress_level=1)
+                    suffix = ".png"
+                self.files.get(f"{key}-{step}{suffix}", data.tell(), lambda f: f.write(data.getbuffer()))
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to build scaled variants of {path.name}. Reason: {e}")
+        finally:
+            with self.lock:
+                self.pending.discard(key)
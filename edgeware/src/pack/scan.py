@@ -0,0 +1,186 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import os
+import time
+import zipfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from filetype import Type
+
+from pack.archive import PackArchive
+from pack.manifest import FileEntry, MediaManifest
+
+# Enough bytes of a file for filetype to recognize it
+HEAD_SIZE = 262
+
+# Sniffing a file is a small read, so on slow or network drives the time is
+# mostly spent waiting. Enough threads are used to keep the drive busy, and
+# files are handed to them in batches to keep the overhead per file low.
+WORKERS = 16
+BATCH_SIZE = 64
+
+
+@dataclass
+class ScanJob:
+    name: str
+    dir: Path
+    match: Callable[[str], Type | None]
+
+    # Scan progress, only touched by the thread consuming the scan
+    dir_mtime: int = 0
+    scan_start: int = 0
+    entries: dict[str, FileEntry] = field(default_factory=dict)
+    batches: int = 0
+
+
+class SerialExecutor(Executor):
+    """Runs tasks immediately in the calling thread, used to scan without threads"""
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def list_dir(job: ScanJob, manifest: MediaManifest) -> tuple[int, list[str], bool]:
+    try:
+        dir_mtime = os.stat(job.dir).st_mtime_ns
+    except OSError:
+        return 0, [], True
+    if not job.dir.is_dir():
+        return 0, [], True
+
+    cached = manifest.cached(job.dir, dir_mtime)
+    if cached is not None:
+        return dir_mtime, cached, True
+
+    with os.scandir(job.dir) as it:
+        return dir_mtime, [entry.name for entry in it if entry.is_file()], False
+
+
+def classify(job: ScanJob, names: list[str], previous: dict[str, FileEntry]) -> list[tuple[str, FileEntry]]:
+    results = []
+    for name in names:
+        path = os.path.join(job.dir, name)
+        try:
+            stat = os.stat(path)
+            entry = previous.get(name)
+            if not (entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns):
+                kind = job.match(path)
+                entry = (stat.st_size, stat.st_mtime_ns, kind.mime if kind else None)
+            results.append((name, entry))
+        except OSError as e:
+            logging.warning(f"Failed to read {name}. Reason: {e}")
+
+    return results
+
+
+def scan_media(manifest: MediaManifest, jobs: list[ScanJob], parallel: bool = True) -> Iterator[tuple[ScanJob, str]]:
+    """
+    Yields the file names of the valid media of every job as soon as they are
+    found. Directories unchanged since the last scan are served from the
+    manifest, in other directories only new and modified files are sniffed.
+    """
+
+    start = time.perf_counter()
+    found = 0
+
+    with ThreadPoolExecutor(WORKERS, thread_name_prefix="media-scan") if parallel else SerialExecutor() as executor:
+        pending: dict[Future, tuple[ScanJob, bool]] = {}  # Future -> (job, listing)
+        for job in jobs:
+            job.scan_start = time.time_ns()
+            pending[executor.submit(list_dir, job, manifest)] = (job, True)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, listing = pending.pop(future)
+
+                if listing:
+                    job.dir_mtime, names, cached = future.result()
+                    if cached:
+                        found += len(names)
+                        for name in names:
+                            yield job, name
+                        continue
+
+                    previous = manifest.entries(job.dir)
+                    for i in range(0, len(names), BATCH_SIZE):
+                        pending[executor.submit(classify, job, names[i : i + BATCH_SIZE], previous)] = (job, False)
+                        job.batches += 1
+                else:
+                    job.batches -= 1
+                    for name, entry in future.result():
+                        job.entries[name] = entry
+                        if entry[2]:
+                            found += 1
+                            yield job, name
+
+                if job.batches == 0:
+                    manifest.update(job.dir, job.dir_mtime, job.scan_start, job.entries)
+
+    logging.info(f"Found {found} media files in {time.perf_counter() - start:.2f} seconds ({'parallel' if parallel else 'serial'} scan).")
+
+
+def scan_archive(manifest: MediaManifest, archive: PackArchive, jobs: list[ScanJob]) -> Iterator[tuple[ScanJob, str]]:
+    """
+    Like scan_media, for packs in an archive. Listing the archive is free, and
+    members are identified by their size and CRC instead of a modification
+    time, so only changed members are sniffed after the archive is replaced.
+    """
+
+    start = time.perf_counter()
+    found = 0
+
+    archive_mtime = os.stat(archive.file).st_mtime_ns
+    for job in jobs:
+        job.scan_start = time.time_ns()
+        cached = manifest.cached(job.dir, archive_mtime)
+        if cached is not None:
+            found += len(cached)
+            yield from ((job, name) for name in cached)
+            continue
+
+        names = archive.list_files(job.dir)
+        previous = manifest.entries(job.dir)
+        for name in names:
+            info = archive.info(job.dir / name)
+            entry = previous.get(name)
+            if not (entry and entry[0] == info.file_size and entry[1] == info.CRC):
+                try:
+                    kind = job.match(archive.head(job.dir / name, HEAD_SIZE))
+                except (OSError, zipfile.BadZipFile) as e:
+                    logging.warning(f"Failed to read {name}. Reason: {e}")
+                    continue
+                entry = (info.file_size, info.CRC, kind.mime if kind else None)
+
+            job.entries[name] = entry
+            if entry[2]:
+                found += 1
+                yield job, name
+
+        manifest.update(job.dir, archive_mtime, job.scan_start, job.entries)
+
+    logging.info(f"Found {found} media files in {time.perf_counter() - start:.2f} seconds (archive scan).")
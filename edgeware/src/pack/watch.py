@@ -0,0 +1,172 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from collections.abc import Callable
+from pathlib import Path
+from threading import Event, Thread
+
+from pack.cache import RACY_WINDOW
+
+# Called with a directory and the names of the files added to and removed from it
+ChangeCallback = Callable[[Path, list[str], list[str]], None]
+
+# Returns the names of the media files currently known in a directory
+KnownCallback = Callable[[Path], set[str]]
+
+POLL_INTERVAL = 2  # Seconds
+
+# From inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def list_files(dir: Path) -> set[str]:
+    try:
+        with os.scandir(dir) as it:
+            return {entry.name for entry in it if entry.is_file()}
+    except OSError:
+        return set()
+
+
+class Watcher:
+    """Base for watchers of the media directories of a pack"""
+
+    def __init__(self, dirs: list[Path], known: KnownCallback, on_change: ChangeCallback) -> None:
+        self.dirs = dirs
+        self.known = known
+        self.on_change = on_change
+        self.stopped = Event()
+
+    def start(self) -> None:
+        Thread(target=self.run, name="pack-watch", daemon=True).start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def run(self) -> None:
+        raise NotImplementedError
+
+    def sync(self, dir: Path) -> None:
+        # Compares the whole directory with the known media, only used when
+        # the changes themselves aren't known
+        files = list_files(dir)
+        known = self.known(dir)
+        added = sorted(files - known)
+        removed = sorted(known - files)
+        if added or removed:
+            self.on_change(dir, added, removed)
+
+
+class PollingWatcher(Watcher):
+    """Lists a directory again whenever its modification time changes"""
+
+    def __init__(self, dirs: list[Path], known: KnownCallback, on_change: ChangeCallback) -> None:
+        super().__init__(dirs, known, on_change)
+        self.mtimes = {dir: self.mtime(dir) for dir in dirs}
+
+    def mtime(self, dir: Path) -> int | None:
+        try:
+            return os.stat(dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def run(self) -> None:
+        while not self.stopped.wait(POLL_INTERVAL):
+            for dir in self.dirs:
+                mtime = self.mtime(dir)
+                # Recently modified directories may change without their modification time changing
+                if mtime != self.mtimes[dir] or (mtime is not None and time.time_ns() - mtime < RACY_WINDOW):
+                    self.mtimes[dir] = mtime
+                    self.sync(dir)
+
+
+class InotifyWatcher(Watcher):
+    """Receives the changes to each directory from the Linux kernel"""
+
+    def __init__(self, dirs: list[Path], known: KnownCallback, on_change: ChangeCallback) -> None:
+        super().__init__(dirs, known, on_change)
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+        self.watches: dict[int, Path] = {}
+        for dir in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(dir), IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE)
+            if wd >= 0:
+                self.watches[wd] = dir
+
+    def run(self) -> None:
+        try:
+            while not self.stopped.is_set():
+                # Waits with a timeout so that the watcher can be stopped
+                ready, _, _ = select.select([self.fd], [], [], 1)
+                if ready:
+                    self.handle(os.read(self.fd, 64 * 1024))
+        finally:
+            os.close(self.fd)
+
+    def handle(self, data: bytes) -> None:
+        changes: dict[Path, dict[str, bool]] = {}  # Dir -> name -> whether it exists after the events
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length].rstrip(b"\0"))
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                logging.warning("Too many changes to the pack media at once, comparing the whole pack.")
+                for dir in self.watches.values():
+                    self.sync(dir)
+                return
+
+            dir = self.watches.get(wd)
+            if dir and name and not mask & IN_ISDIR:
+                changes.setdefault(dir, {})[name] = bool(mask & (IN_CLOSE_WRITE | IN_MOVED_TO))
+
+        for dir, names in changes.items():
+            self.on_change(dir, [name for name, exists in names.items() if exists], [name for name, exists in names.items() if not exists])
+
+
+def watch(dirs: list[Path], known: KnownCallback, on_change: ChangeCallback) -> Watcher:
+    try:
+        watcher = InotifyWatcher(dirs, known, on_change)
+        logging.info("Watching pack media with inotify.")
+    except (OSError, AttributeError, TypeError) as e:
+        watcher = PollingWatcher(dirs, known, on_change)
+        logging.info(f"Watching pack media by polling. Reason: {e}")
+
+    watcher.start()
+    return watcher
@@ -15,8 +15,11 @@
 # You should have received a copy of the GNU General Public License
 # along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
 
+import io
+import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import IO
 
 PATH = Path(__file__).parent.parent
 DEFAULT_PACK_PATH = PATH / "resource"
@@ -30,8 +33,6 @@ class Process:
     MAIN = ROOT / "main_edgeware.py"
     PANIC = ROOT / "panic.py"
 
-    LINUX_MPV = ROOT / "os_utils" / "linux_mpv_subprocess.py"
-
 
 @dataclass
 class Assets:
@@ -75,10 +76,20 @@ class Data:
     PACKS = ROOT / "packs"
     PRESETS = ROOT / "presets"
     BLACKLIST = ROOT / "blacklist"
+    CACHE = ROOT / "cache"
+
+    # Cache directories
+    INDEX_CACHE = CACHE / "index"
+    EXTRACT_CACHE = CACHE / "extract"
+    MEDIA_CACHE = CACHE / "media"
+    METADATA_CACHE = CACHE / "metadata"
+    SCALED_CACHE = CACHE / "scaled"
+    BOORU_CACHE = CACHE / "booru"
 
     # Files
     CONFIG = ROOT / "config.json"
     CORRUPTION_LAUNCHES = ROOT / "corruption_launches.dat"
+    MOOD_FINGERPRINTS = MOODS / "fingerprints.json"
 
     # Changed defaults
     CONFIG_ICON = ROOT / "config_icon.ico"
@@ -119,6 +130,14 @@ class PackPaths:
     def __init__(self, root: Path) -> None:
         self.root = root
 
+        # Packs can also be run from a zip file, the paths below are then
+        # inside the archive and have to be accessed through these methods
+        self.archive = None
+        if root.suffix.lower() == ".zip" and root.is_file():
+            from pack.archive import PackArchive  # Depends on this module
+
+            self.archive = PackArchive(root)
+
         # Directories
         self.audio = self.root / "aud"
         self.hypno = self.root / "subliminals"
@@ -140,3 +159,37 @@ class PackPaths:
         self.media = self.root / "media.json"
         self.prompt = self.root / "prompt.json"
         self.web = self.root / "web.json"
+
+    def open(self, path: Path, mode: str = "r") -> IO:
+        if not (self.archive and self.archive.contains(path)):
+            return open(path, mode)
+        if mode not in ["r", "rb"]:
+            raise ValueError(f"Pack archives are read-only, can't open with mode {mode}")
+
+        file = self.archive.open(path)
+        return file if mode == "rb" else io.TextIOWrapper(file)
+
+    def stream(self, path: Path) -> IO:
+        # Like open in binary mode, but never extracts archive members
+        if not (self.archive and self.archive.contains(path)):
+            return open(path, "rb")
+        return self.archive.stream(path)
+
+    def local(self, path: Path) -> Path:
+        # A path to a real file, for anything that can't read from a file object
+        return self.archive.local(path) if self.archive and self.archive.contains(path) else path
+
+    def is_file(self, path: Path) -> bool:
+        return self.archive.is_file(path) if self.archive and self.archive.contains(path) else path.is_file()
+
+    def is_dir(self, path: Path) -> bool:
+        return self.archive.is_dir(path) if self.archive and self.archive.contains(path) else path.is_dir()
+
+    def list_files(self, dir: Path) -> list[str]:
+        if self.archive and self.archive.contains(dir):
+            return self.archive.list_files(dir)
+        try:
+            with os.scandir(dir) as it:
+                return [entry.name for entry in it if entry.is_file()]
+        except OSError:
+            return []
@@ -0,0 +1,122 @@
+# Copyright (C) 2025 Araten & Marigold
+#
+# This file is part of Edgeware++.
+#
+# Edgeware++ is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Edgeware++ is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Edgeware++.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+from threading import Lock
+
+import numpy as np
+from screeninfo import Monitor
+
+# Side of the squares that the possible positions of a popup are divided into,
+# considering each pixel individually is unnecessary and too slow
+CELL_SIDE = 50
+
+# Upper bound on the number of cell and popup pairs computed at once
+CHUNK_SIZE = 2**20
+
+# (width, height, x, y)
+Geometry = tuple[int, int, int, int]
+MonitorKey = tuple[int, int, int, int]
+
+
+def monitor_key(monitor: Monitor) -> MonitorKey:
+    return monitor.x, monitor.y, monitor.width, monitor.height
+
+
+class PopupGeometries:
+    """
+    Geometries of the open popups, indexed by the monitor they were placed
+    on. Popups are placed and moved within their monitor, so only popups on
+    the same monitor can overlap a new one, the others only add to the
+    distance weights.
+    """
+
+    def __init__(self) -> None:
+        self.geometries: dict[int, tuple[Geometry, MonitorKey]] = {}  # popup_id -> (geometry, monitor)
+        self.arrays: dict[MonitorKey, tuple[np.ndarray, np.ndarray]] = {}  # Cached until a popup is added or removed
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.geometries)
+
+    def add(self, popup_id: int, geometry: Geometry, monitor: Monitor) -> None:
+        with self.lock:
+            self.geometries[popup_id] = (geometry, monitor_key(monitor))
+            self.arrays.clear()
+
+    def pop(self, popup_id: int) -> None:
+        with self.lock:
+            self.geometries.pop(popup_id, None)
+            self.arrays.clear()
+
+    def split(self, monitor: Monitor) -> tuple[np.ndarray, np.ndarray]:
+        # Geometries on the given monitor and on other monitors as (n, 4) arrays
+        key = monitor_key(monitor)
+        with self.lock:
+            if key not in self.arrays:
+                same = [geometry for geometry, other in self.geometries.values() if other == key]
+                others = [geometry for geometry, other in self.geometries.values() if other != key]
+                self.arrays[key] = (np.array(same, dtype=np.float64).reshape(-1, 4), np.array(others, dtype=np.float64).reshape(-1, 4))
+            return self.arrays[key]
+
+
+def cell_weights(geometries: PopupGeometries, monitor: Monitor, width: int, height: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the x and y coordinates of the cells a popup of the given size can
+    be placed in and the weight of each cell, as (x cells, y cells) arrays.
+    Positions that reduce popup overlap and clustering are preferred: the
+    weight of a cell is the minimum of 2 ** (32 * nonoverlap) + distance ** 2
+    over all open popups, or 1 if there are none.
+    """
+
+    x = np.arange((monitor.width - width) // CELL_SIDE, dtype=np.float64) * CELL_SIDE + monitor.x
+    y = np.arange((monitor.height - height) // CELL_SIDE, dtype=np.float64) * CELL_SIDE + monitor.y
+    same, others = geometries.split(monitor)
+    if len(same) + len(others) == 0:
+        return x, y, np.ones((len(x), len(y)))
+
+    weights = np.full((len(x), len(y)), np.inf)
+    chunk = max(1, CHUNK_SIZE // max(1, len(x) * len(y)))
+    for overlap, array in [(True, same), (False, others)]:
+        for start in range(0, len(array), chunk):
+            w, h, gx, gy = array[start : start + chunk].T
+
+            # (cells, popups) for each axis, combined into (x cells, y cells, popups)
+            dx = (x[:, None] + width / 2 - (gx + w / 2)) ** 2
+            dy = (y[:, None] + height / 2 - (gy + h / 2)) ** 2
+            distance_squared = dx[:, None, :] + dy[None, :, :]
+            if overlap:
+                ix = np.maximum(0, np.minimum(x[:, None] + width, gx + w) - np.maximum(x[:, None], gx))
+                iy = np.maximum(0, np.minimum(y[:, None] + height, gy + h) - np.maximum(y[:, None], gy))
+                nonoverlap = 1 - ix[:, None, :] * iy[None, :, :] / (width * height)
+                terms = np.exp2(32 * nonoverlap) + distance_squared
+            else:
+                terms = 2.0**32 + distance_squared
+            np.minimum(weights, terms.min(axis=2), out=weights)
+
+    return x, y, weights
+
+
+def choose_cell(geometries: PopupGeometries, monitor: Monitor, width: int, height: int) -> tuple[int, int]:
+    # Chosen like random.choices, from the top left corners of the cells
+    x, y, weights = cell_weights(geometries, monitor, width, height)
+    if weights.size == 0:
+        return monitor.x, monitor.y
+
+    cumulative = np.cumsum(weights, axis=None)
+    i = min(int(np.searchsorted(cumulative, random.random() * cumulative[-1], side="right")), weights.size - 1)
+    return int(x[i // len(y)]), int(y[i % len(y)])
@@ -19,6 +19,8 @@ from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any
 
+from placement import PopupGeometries
+
 
 @dataclass
 class Subject:
@@ -40,8 +42,7 @@ class State:
     prompt_active = False
     video_number = 0
 
-    # popup_id -> (width, height, x, y)
-    popup_geometries: dict[int, (int, int, int, int)] = field(default_factory=dict)
+    popup_geometries: PopupGeometries = field(default_factory=PopupGeometries)
     _next_popup_id = 0
 
     panic_lockout_active = False
@@ -24,8 +24,10 @@ import time
 from hashlib import md5
 
 from config.settings import Settings
+from os_utils.capabilities import monitor_cache
+from pack.cache import RACY_WINDOW, load_json_cache, save_json_cache
 from paths import Data, PackPaths
-from screeninfo import Monitor, get_monitors
+from screeninfo import Monitor
 
 
 class RedactUsernameFormatter(logging.Formatter):
@@ -49,17 +51,56 @@ def init_logging(filename: str) -> str:
 
 
 def compute_mood_id(paths: PackPaths) -> str:
+    # Hashing every file name in the pack is slow for large packs, so the ID is
+    # stored with the modification times of all directories in the pack. Files
+    # can't be added, removed or renamed without changing the modification time
+    # of their directory, so the ID can be reused while none of them change.
+    key = str(paths.root.resolve())
+    fingerprints = load_json_cache(Data.MOOD_FINGERPRINTS).get("packs", {})
+
+    fingerprint = fingerprints.get(key)
+    if fingerprint and fingerprint_valid(paths, fingerprint["dirs"]):
+        return fingerprint["id"]
+
+    # Recently modified directories may change again without their modification time changing
+    racy = time.time_ns() - RACY_WINDOW
+
     data = []
-    for path, dirs, files in os.walk(paths.root):
-        data.append(sorted(files))
+    dirs = {}
+    if paths.archive:
+        # Archives can't change without their own modification time changing
+        data = [sorted(files) for files in paths.archive.dirs.values()]
+        mtime = os.stat(paths.root).st_mtime_ns
+        dirs["."] = mtime if mtime < racy else None
+    else:
+        for path, _, files in os.walk(paths.root):
+            data.append(sorted(files))
+            mtime = os.stat(path).st_mtime_ns
+            dirs[os.path.relpath(path, paths.root)] = mtime if mtime < racy else None
+
+    mood_id = md5(str(sorted(data)).encode()).hexdigest()
+
+    fingerprints[key] = {"id": mood_id, "dirs": dirs}
+    save_json_cache(Data.MOOD_FINGERPRINTS, {"packs": fingerprints})
+
+    return mood_id
+
+
+def fingerprint_valid(paths: PackPaths, dirs: dict[str, int | None]) -> bool:
+    for dir, mtime in dirs.items():
+        try:
+            if mtime is None or os.stat(paths.root / dir).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
 
-    return md5(str(sorted(data)).encode()).hexdigest()
+    return True
 
 
 def primary_monitor() -> Monitor:
-    return next(m for m in get_monitors() if m.is_primary)
+    return next(m for m in monitor_cache.get() if m.is_primary)
 
 
 def random_monitor(settings: Settings) -> Monitor:
-    enabled_monitors = [m for m in get_monitors() if m.name not in settings.disabled_monitors]
+    enabled_monitors = [m for m in monitor_cache.get() if m.name not in settings.disabled_monitors]
     return random.choice(enabled_monitors or primary_monitor())